@@ -0,0 +1,134 @@
+"""
+Incremental Banker's Algorithm
+Stateful deadlock avoidance over NumPy need/allocation matrices
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class Banker:
+    def __init__(self, available, max_need, allocation=None, processes=None):
+        """
+        Args:
+            available: Free units of each resource (length m)
+            max_need: Maximum claim of each process (n x m)
+            allocation: Units each process currently holds (n x m),
+                none if omitted
+            processes: Process names for safe sequences, default 0..n-1
+        """
+        self.max_need = np.array(max_need, dtype=np.int64).reshape(len(max_need), -1)
+        n, m = self.max_need.shape
+        self.available = np.array(available, dtype=np.int64).reshape(m)
+        if allocation is None:
+            self.allocation = np.zeros((n, m), dtype=np.int64)
+        else:
+            self.allocation = np.array(allocation, dtype=np.int64).reshape(n, m)
+        self.need = self.max_need - self.allocation
+        self.processes = list(processes) if processes is not None else list(range(n))
+        self.index = {p: i for i, p in enumerate(self.processes)}
+
+        self.granted = 0
+        self.denied = 0
+        # Requests are only granted into safe states, and releases keep a
+        # state safe, so after this the cheap targeted check is enough
+        self.safe = self._safe_order()[0]
+
+    def _safe_order(self, target=None):
+        # Worklist safety check. Each resource keeps the processes sorted
+        # by their need of it and a pointer to the first one that does not
+        # fit in the current work vector; a process is ready once every
+        # pointer has passed it. Every (process, resource) pair is passed
+        # at most once, so the check is O(n*m) plus the per-resource sorts.
+        # With a target, stop as soon as that process can finish: from a
+        # previously safe state, everything else can finish after it.
+        n, m = self.need.shape
+        need = self.need.tolist()
+        allocation = self.allocation.tolist()
+        work = self.available.tolist()
+        order = np.argsort(self.need, axis=0, kind="stable").T.tolist()
+
+        blocked = [m] * n       # resources whose pointer has not passed i
+        pointers = [0] * m
+        ready = deque()
+
+        def advance(j):
+            column = order[j]
+            p = pointers[j]
+            w = work[j]
+            while p < n and need[column[p]][j] <= w:
+                i = column[p]
+                blocked[i] -= 1
+                if blocked[i] == 0:
+                    ready.append(i)
+                p += 1
+            pointers[j] = p
+
+        for j in range(m):
+            advance(j)
+
+        sequence = []
+        while ready:
+            i = ready.popleft()
+            sequence.append(i)
+            if i == target:
+                return True, sequence
+            for j, units in enumerate(allocation[i]):
+                if units:
+                    work[j] += units
+                    advance(j)
+
+        return len(sequence) == n, sequence
+
+    def is_safe(self):
+        """
+        Returns:
+            tuple: (is_safe, safe_sequence) like deadlock.bankers.is_safe
+        """
+        safe, order = self._safe_order()
+        if not safe:
+            return False, []
+        return True, [self.processes[i] for i in order]
+
+    def request(self, process, vector):
+        """
+        Grant the request only if the resulting state is safe
+
+        Returns:
+            bool: True if granted, False if the process has to wait
+        """
+        i = self.index[process]
+        vector = np.asarray(vector, dtype=np.int64)
+        if (vector > self.need[i]).any():
+            raise ValueError(f"{process} requested more than its maximum claim")
+        if (vector > self.available).any():
+            self.denied += 1
+            return False
+
+        # Pretend to allocate, keep it only if the state stays safe
+        self.available -= vector
+        self.allocation[i] += vector
+        self.need[i] -= vector
+        if self._safe_order(target=i if self.safe else None)[0]:
+            self.safe = True
+            self.granted += 1
+            return True
+
+        self.available += vector
+        self.allocation[i] -= vector
+        self.need[i] += vector
+        self.denied += 1
+        return False
+
+    def release(self, process, vector=None):
+        """Return resources, all the process holds if vector is None"""
+        i = self.index[process]
+        vector = self.allocation[i].copy() if vector is None else np.asarray(vector, dtype=np.int64)
+        if (vector > self.allocation[i]).any():
+            raise ValueError(f"{process} released more than it holds")
+        self.available += vector
+        self.allocation[i] -= vector
+        self.need[i] += vector
+        if not self.safe:
+            self.safe = self._safe_order()[0]
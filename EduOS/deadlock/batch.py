@@ -0,0 +1,118 @@
+"""
+Batched Banker's Algorithm
+Safety of many independent scenarios at once over 3-D NumPy stacks
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+CHUNK_ELEMENTS = 1 << 22    # need-matrix entries evaluated per chunk
+
+
+def _safe_chunk(available, max_need, allocation):
+    # Same passes as deadlock.bankers.is_safe, with each step applied to
+    # every scenario at once. Scenarios drop out of the working set once
+    # they have finished or a pass found nothing for them.
+    b, n, m = max_need.shape
+    need = max_need - allocation
+    work = available.copy()
+    finish = np.zeros((b, n), dtype=bool)
+    count = np.zeros(b, dtype=np.intp)
+    sequences = np.full((b, n), -1, dtype=np.int64)
+
+    live = np.arange(b)
+    while len(live):
+        w = work[live]
+        nd = need[live]
+        al = allocation[live]
+        fin = finish[live]
+        cnt = count[live]
+        seq = sequences[live]
+        found = np.zeros(len(live), dtype=bool)
+        for i in range(n):
+            ok = ~fin[:, i] & (nd[:, i] <= w).all(axis=1)
+            rows = np.flatnonzero(ok)
+            if len(rows):
+                w[rows] += al[rows, i]
+                fin[rows, i] = True
+                seq[rows, cnt[rows]] = i
+                cnt[rows] += 1
+                found[rows] = True
+
+        work[live] = w
+        finish[live] = fin
+        count[live] = cnt
+        sequences[live] = seq
+        live = live[found & (cnt < n)]
+
+    safe = count == n
+    sequences[~safe] = -1
+    return safe, sequences
+
+
+def batch_is_safe(available, max_need, allocation, chunk_size=None, workers=None):
+    """
+    Check many Banker's states at once
+
+    Args:
+        available: Free resources per scenario (B x m), or one vector (m)
+            shared by all scenarios
+        max_need: Maximum claims (B x n x m), or one matrix (n x m)
+        allocation: Current allocations (B x n x m), or one matrix (n x m)
+        chunk_size: Scenarios evaluated together, default sized so a
+            chunk's need matrix holds about CHUNK_ELEMENTS entries
+        workers: Processes for batches of more than one chunk; None uses
+            every CPU, 1 evaluates the chunks in this process
+
+    Returns:
+        tuple: (safe, sequences) -- a boolean mask of length B and a
+        B x n array of process indices in the order is_safe() would
+        finish them, -1 throughout for unsafe scenarios
+    """
+    max_need = np.asarray(max_need, dtype=np.int64)
+    allocation = np.asarray(allocation, dtype=np.int64)
+    available = np.asarray(available, dtype=np.int64)
+    n, m = max_need.shape[-2:]
+    b = max([1]
+            + [a.shape[0] for a in (max_need, allocation) if a.ndim == 3]
+            + [len(available)] * (available.ndim == 2))
+    max_need = np.broadcast_to(max_need, (b, n, m))
+    allocation = np.broadcast_to(allocation, (b, n, m))
+    available = np.broadcast_to(available, (b, m))
+
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_ELEMENTS // max(1, n * m))
+    if b <= chunk_size:
+        return _safe_chunk(available, max_need, allocation)
+
+    # Too big for one pass: evaluate slices of the stacks separately so
+    # only a few chunks' temporaries exist at a time. The stacks may be
+    # memory-mapped; a slice is only read when its chunk is evaluated.
+    starts = range(0, b, chunk_size)
+
+    def chunk(s):
+        return (np.array(available[s:s + chunk_size]),
+                np.array(max_need[s:s + chunk_size]),
+                np.array(allocation[s:s + chunk_size]))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(starts))
+    if workers > 1:
+        results = []
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for s in starts:
+                pending.append(pool.submit(_safe_chunk, *chunk(s)))
+                if len(pending) >= 2 * workers:
+                    results.append(pending.popleft().result())
+            results.extend(f.result() for f in pending)
+    else:
+        results = [_safe_chunk(*chunk(s)) for s in starts]
+
+    safe = np.concatenate([r[0] for r in results])
+    sequences = np.concatenate([r[1] for r in results])
+    return safe, sequences
@@ -0,0 +1,210 @@
+"""
+Deadlock Detection
+Incremental cycle detection on the resource-allocation graph of
+Mutex/Semaphore waits, with recovery by aborting a victim thread
+"""
+
+import time
+
+
+class DeadlockDetector:
+    # Nodes are threads and resources. A thread waiting for a resource has
+    # an edge thread -> resource, a resource has an edge to every thread
+    # holding a unit of it. With single-unit resources (mutexes, binary
+    # semaphores) a cycle is a deadlock; with counting semaphores it is
+    # only a possible one, so pass the detector to semaphores used as locks.
+    #
+    # The graph is kept acyclic together with a topological order
+    # (Pearce-Kelly): an edge that agrees with the order needs no search,
+    # otherwise only the nodes ordered between its endpoints are visited
+    # and reordered. A cycle is found the moment its last edge is added.
+    def __init__(self, metrics=None, recover=True):
+        """
+        Args:
+            metrics: Optional utils.metrics.Metrics to report to
+            recover: Abort a victim when a deadlock is found; otherwise
+                the closing request is only recorded, not added
+        """
+        self.metrics = metrics
+        self.recover = recover
+        self.succ = {}          # node -> set of successors
+        self.pred = {}          # node -> set of predecessors
+        self.order = {}         # node -> position in the topological order
+        self.next_order = 0
+        self.waiting = {}       # thread -> resource it is blocked on
+        self.holding = {}       # thread -> resource -> units held
+        self.deadlocks = []     # one record per detected deadlock
+        self.visited = 0        # nodes searched by all insertions
+
+    def _node(self, node):
+        if node not in self.order:
+            # A new node has no edges, so it can go last
+            self.order[node] = self.next_order
+            self.next_order += 1
+            self.succ[node] = set()
+            self.pred[node] = set()
+
+    def _forget(self, node):
+        if not self.succ[node] and not self.pred[node]:
+            del self.succ[node], self.pred[node], self.order[node]
+
+    def _remove_edge(self, u, v):
+        # Deleting an edge never invalidates a topological order
+        if v not in self.succ.get(u, ()):
+            return
+        self.succ[u].discard(v)
+        self.pred[v].discard(u)
+        self._forget(u)
+        self._forget(v)
+
+    def _add_edge(self, u, v):
+        """Insert u -> v, or return the cycle it would close without inserting"""
+        self._node(u)
+        self._node(v)
+        order = self.order
+        lower, upper = order[v], order[u]
+        if lower < upper:
+            # Forward search from v among nodes ordered before u
+            parent = {v: None}
+            stack = [v]
+            forward = []
+            while stack:
+                node = stack.pop()
+                forward.append(node)
+                for w in self.succ[node]:
+                    if w is u:
+                        path = [node]
+                        while parent[path[-1]] is not None:
+                            path.append(parent[path[-1]])
+                        self.visited += len(parent)
+                        return [u] + path[::-1]
+                    if w not in parent and order[w] < upper:
+                        parent[w] = node
+                        stack.append(w)
+
+            # Backward search from u among nodes ordered after v
+            seen = {u}
+            stack = [u]
+            backward = []
+            while stack:
+                node = stack.pop()
+                backward.append(node)
+                for w in self.pred[node]:
+                    if w not in seen and order[w] > lower:
+                        seen.add(w)
+                        stack.append(w)
+            self.visited += len(forward) + len(backward)
+
+            # Everything that reaches u moves ahead of everything v reaches,
+            # reusing the same set of positions
+            backward.sort(key=order.__getitem__)
+            forward.sort(key=order.__getitem__)
+            nodes = backward + forward
+            for node, position in zip(nodes, sorted(order[n] for n in nodes)):
+                order[node] = position
+
+        self.succ[u].add(v)
+        self.pred[v].add(u)
+        return None
+
+    def wait(self, thread, resource):
+        """thread blocked on resource; returns the deadlock record, if any"""
+        start = time.perf_counter_ns()
+        cycle = self._add_edge(thread, resource)
+        if cycle is None:
+            self.waiting[thread] = resource
+            return None
+
+        latency = time.perf_counter_ns() - start
+        threads = [node for node in cycle if node in self.waiting or node is thread]
+        victim = self.choose_victim(threads)
+        record = {
+            "cycle": cycle,
+            "victim": victim,
+            "latency_ns": latency,
+            "rollback": sum(self.holding.get(victim, {}).values()),
+        }
+        self.deadlocks.append(record)
+        if self.metrics is not None:
+            self.metrics.record_deadlock(latency, record["rollback"])
+        if not self.recover:
+            return record
+
+        # Marked as waiting without its edge, so a wake-up during the abort
+        # below is noticed
+        self.waiting[thread] = resource
+        self.abort(victim)
+        if self.waiting.get(thread) is resource:
+            # The cycle went through the victim, but the request may close
+            # another one as well
+            del self.waiting[thread]
+            self.wait(thread, resource)
+        return record
+
+    def choose_victim(self, threads):
+        """
+        Thread to abort among those on a cycle: the one holding the fewest
+        resource units, so the least work is rolled back, and of those the
+        most recently seen
+        """
+        return min(threads, key=lambda t: (sum(self.holding.get(t, {}).values()),
+                                           -self.order.get(t, 0)))
+
+    def abort(self, thread):
+        """
+        Break a deadlock: cancel the thread's request and release every
+        unit it holds, which wakes the next waiters of those resources
+        """
+        resource = self.waiting.pop(thread, None)
+        if resource is not None:
+            self._remove_edge(thread, resource)
+            resource.cancel(thread)
+        for resource, units in list(self.holding.get(thread, {}).items()):
+            for _ in range(units):
+                resource.revoke(thread)
+        thread.state = "TERMINATED"
+
+    def acquired(self, thread, resource):
+        """thread now holds one more unit of resource"""
+        if self.waiting.get(thread) is resource:
+            del self.waiting[thread]
+            self._remove_edge(thread, resource)
+        held = self.holding.setdefault(thread, {})
+        if resource not in held:
+            # The thread is not waiting any more, so this cannot close a cycle
+            self._add_edge(resource, thread)
+        held[resource] = held.get(resource, 0) + 1
+
+    def released(self, thread, resource):
+        """thread gave back one unit of resource"""
+        held = self.holding.get(thread)
+        if not held or resource not in held:
+            return
+        held[resource] -= 1
+        if not held[resource]:
+            del held[resource]
+            if not held:
+                del self.holding[thread]
+            self._remove_edge(resource, thread)
+
+    def find_cycle(self):
+        """Full search of the graph, for checking the incremental state"""
+        color = {}
+        for root in self.succ:
+            if root in color:
+                continue
+            color[root] = 1
+            stack = [(root, iter(self.succ[root]))]
+            while stack:
+                node, edges = stack[-1]
+                for w in edges:
+                    if color.get(w) == 1:
+                        return w
+                    if w not in color:
+                        color[w] = 1
+                        stack.append((w, iter(self.succ[w])))
+                        break
+                else:
+                    color[node] = 2
+                    stack.pop()
+        return None
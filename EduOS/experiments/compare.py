@@ -2,15 +2,17 @@ from kernel.kernel import Kernel
 from experiments.workload import standard_workload
 from experiments.run_policy import run_scheduler
 
-from scheduler.fcfs import fcfs
-from scheduler.srtf import srtf
-from scheduler.mlfq import mlfq
+from scheduler.fcfs import FCFSPolicy
+from scheduler.srtf import SRTFPolicy
+from scheduler.mlfq import MLFQPolicy
+from scheduler.round_robin import RoundRobinPolicy
 
 def compare():
     policies = {
-        "FCFS": fcfs,
-        "SRTF": srtf,
-        "MLFQ": mlfq
+        "FCFS": FCFSPolicy,
+        "SRTF": SRTFPolicy,
+        "MLFQ": MLFQPolicy,
+        "RR": lambda: RoundRobinPolicy(quantum=2)
     }
 
     results = {}
@@ -18,7 +20,7 @@ def compare():
     for name, policy in policies.items():
         kernel = Kernel()
         processes = standard_workload()
-        metrics, _ = run_scheduler(kernel, policy, processes)
+        metrics, _ = run_scheduler(kernel, policy(), processes)
         results[name] = metrics
 
     return results
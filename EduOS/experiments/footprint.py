@@ -0,0 +1,34 @@
+"""
+Memory Footprint Benchmark
+Measures resident bytes per simulated process
+"""
+
+import tracemalloc
+
+from kernel.kernel import Kernel
+
+
+def bytes_per_process(n=100000):
+    """
+    Create n processes through the kernel and measure their allocations
+
+    Args:
+        n: Number of processes to create
+
+    Returns:
+        float: Bytes allocated per process (PCB, Process and table entry)
+    """
+    kernel = Kernel()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    for pid in range(n):
+        kernel.create_process(pid, 0, 10)
+
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / n
+
+
+if __name__ == "__main__":
+    print(f"Memory per process: {bytes_per_process():.1f} bytes")
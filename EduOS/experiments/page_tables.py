@@ -0,0 +1,73 @@
+"""
+Page Table Benchmark
+Compares memory use and lookup latency of the page table formats
+"""
+
+import random
+import time
+import tracemalloc
+
+from memory.page_table import PAGE_TABLE_FORMATS, new_page_table
+
+
+def sparse_pages(mapped=4096, regions=16, address_bits=36, seed=0):
+    """
+    Page numbers of a sparse address space: a few dense regions (code,
+    heap, stacks, mappings) scattered over a large virtual range
+    """
+    rng = random.Random(seed)
+    per_region = mapped // regions
+    pages = []
+    for _ in range(regions):
+        base = rng.randrange(0, (1 << address_bits) - per_region)
+        pages.extend(range(base, base + per_region))
+    return pages
+
+
+def benchmark(pages, lookups=200000, seed=0):
+    """
+    Build one page table per format over the same pages and time lookups
+
+    Returns:
+        dict: format -> {"bytes", "bytes_per_page", "lookup_ns", "copy_us"}
+    """
+    rng = random.Random(seed)
+    probes = [rng.choice(pages) for _ in range(lookups)]
+    results = {}
+
+    for kind in PAGE_TABLE_FORMATS:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        table = new_page_table(kind)
+        for frame, page in enumerate(pages):
+            table[page] = frame
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        get = table.get
+        start = time.perf_counter()
+        for page in probes:
+            get(page)
+        lookup = time.perf_counter() - start
+
+        # Cost of the page-table copy done by fork (a two-level table
+        # shares its second-level arrays instead)
+        clone = table.share if hasattr(table, "share") else table.copy
+        start = time.perf_counter()
+        clone()
+        copy = time.perf_counter() - start
+
+        results[kind] = {
+            "bytes": size,
+            "bytes_per_page": size / len(pages),
+            "lookup_ns": lookup / lookups * 1e9,
+            "copy_us": copy * 1e6,
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    for kind, r in benchmark(sparse_pages()).items():
+        print(f"{kind:10s} {r['bytes_per_page']:7.1f} B/page "
+              f"{r['lookup_ns']:7.1f} ns/lookup {r['copy_us']:9.1f} us/copy")
@@ -0,0 +1,161 @@
+"""
+Priority Inversion Experiment
+How long high-priority tasks wait for mutexes under no protocol,
+priority inheritance and priority ceiling
+"""
+
+import random
+
+from process.process import Process
+from sync.mutex import Mutex
+from sync.priority import PriorityInheritance, PriorityCeiling
+
+PROTOCOLS = {
+    "None": lambda: None,
+    "Inherit": PriorityInheritance,
+    "Ceiling": PriorityCeiling,
+}
+
+
+def classic_tasks():
+    """
+    Low-priority L holds the lock that high-priority H needs while
+    medium-priority M, which needs no lock, is ready to run
+    (pid, arrival, priority, script) with ("run", ticks), ("lock", i)
+    and ("unlock", i) steps
+    """
+    return [
+        (0, 0, 3, [("run", 1), ("lock", 0), ("run", 4), ("unlock", 0), ("run", 1)]),
+        (1, 2, 1, [("run", 1), ("lock", 0), ("run", 2), ("unlock", 0)]),
+        (2, 3, 2, [("run", 10)]),
+    ]
+
+
+def random_tasks(tasks=30, locks=4, seed=0):
+    """Tasks of random priority with short critical sections between runs"""
+    rng = random.Random(seed)
+    result = []
+    for pid in range(tasks):
+        script = []
+        for _ in range(rng.randint(1, 3)):
+            script.append(("run", rng.randint(1, 5)))
+            if rng.random() < 0.6:
+                lock = rng.randrange(locks)
+                script += [("lock", lock), ("run", rng.randint(1, 4)), ("unlock", lock)]
+        result.append((pid, rng.randint(0, tasks * 4), rng.randint(0, 9), script))
+    return result
+
+
+def run(tasks, protocol=None, queue="priority"):
+    """
+    Tick-by-tick preemptive priority dispatch (lower value runs first, as
+    in scheduler.preemptive_priority, without aging so inversions are not
+    hidden) of tasks sharing mutexes
+
+    Returns:
+        dict: pid -> (ticks blocked on mutexes, ticks from arrival to
+        completion not spent running)
+    """
+    locks = 1 + max((arg for _, _, _, script in tasks
+                     for op, arg in script if op != "run"), default=-1)
+    ceilings = [min((priority for _, _, priority, script in tasks
+                     if ("lock", i) in script), default=None) for i in range(locks)]
+    mutexes = [Mutex(queue=queue, protocol=protocol, ceiling=c) for c in ceilings]
+
+    scripts = {}
+    for pid, arrival, priority, script in sorted(tasks, key=lambda t: t[1]):
+        process = Process(pid, arrival, 0, priority)
+        scripts[process.create_thread()] = script
+    threads = list(scripts)
+    blocked = dict.fromkeys(threads, 0)
+    steps = dict.fromkeys(threads, 0)
+    remaining = dict.fromkeys(threads, 0)
+
+    time = 0
+    done = 0
+    for t in threads:
+        if not scripts[t]:
+            t.process.pcb.completion_time = t.process.pcb.arrival_time
+            done += 1
+    while done < len(threads):
+        # Lock operations take no time: keep dispatching until some thread
+        # spends this tick running
+        while True:
+            ready = [(t.process.pcb.priority, t.process.pcb.arrival_time, t.process.pcb.pid, t)
+                     for t in threads
+                     if t.process.pcb.arrival_time <= time and t.state == "READY"
+                     and steps[t] < len(scripts[t])]
+            if not ready:
+                break
+            thread = min(ready)[3]
+            script = scripts[thread]
+            ran = False
+            while steps[thread] < len(script):
+                op, arg = script[steps[thread]]
+                if op == "run":
+                    if remaining[thread] == 0:
+                        remaining[thread] = arg
+                    remaining[thread] -= 1
+                    if remaining[thread] == 0:
+                        steps[thread] += 1
+                    ran = True
+                    break
+                steps[thread] += 1
+                if op == "lock":
+                    mutexes[arg].acquire(thread)
+                    if thread.state == "WAITING":
+                        break
+                else:
+                    # A waiter may now outrank this thread
+                    mutexes[arg].release()
+                    break
+            if steps[thread] == len(script):
+                thread.process.pcb.completion_time = time + ran
+                done += 1
+            if ran:
+                break
+
+        for t in threads:
+            if t.state == "WAITING":
+                blocked[t] += 1
+        time += 1
+
+    result = {}
+    for t in threads:
+        pcb = t.process.pcb
+        work = sum(arg for op, arg in scripts[t] if op == "run")
+        result[pcb.pid] = (blocked[t], pcb.completion_time - pcb.arrival_time - work)
+    return result
+
+
+def compare(tasks=None):
+    """
+    Blocking and total delay of the highest-priority tasks per protocol.
+    Under the ceiling protocol a task is delayed rather than blocked: it
+    cannot preempt a lower-priority task inside a critical section.
+
+    Returns:
+        dict: protocol -> {"max_blocking", "avg_blocking", "max_delay",
+        "avg_delay"} over the tasks of the best priority level
+    """
+    tasks = classic_tasks() if tasks is None else tasks
+    top = min(priority for _, _, priority, _ in tasks)
+    urgent = [pid for pid, _, priority, _ in tasks if priority == top]
+    results = {}
+    for name, protocol in PROTOCOLS.items():
+        outcome = run(tasks, protocol())
+        blocking = [outcome[pid][0] for pid in urgent]
+        delay = [outcome[pid][1] for pid in urgent]
+        results[name] = {
+            "max_blocking": max(blocking),
+            "avg_blocking": sum(blocking) / len(blocking),
+            "max_delay": max(delay),
+            "avg_delay": sum(delay) / len(delay),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    for label, tasks in (("classic", classic_tasks()), ("random", random_tasks())):
+        for name, result in compare(tasks).items():
+            print(f"{label:8s} {name:8s}", ", ".join(f"{k}={v:.1f}" for k, v in result.items()))
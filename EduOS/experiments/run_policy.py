@@ -1,10 +1,32 @@
 from utils.metrics import Metrics
+from scheduler.engine import SchedulingPolicy, simulate
 
-def run_scheduler(kernel, scheduler_fn, processes):
+def run_scheduler(kernel, policy, processes):
+    """
+    Run a workload under a SchedulingPolicy (or a legacy scheduler
+    function) and collect kernel metrics for it
+    """
     kernel.metrics = Metrics()
-    gantt = scheduler_fn(processes)
+
+    if isinstance(policy, SchedulingPolicy):
+        gantt, _ = simulate(processes, policy)
+    else:
+        gantt = policy(processes)
+        if isinstance(gantt, tuple):
+            gantt = gantt[0]
 
     for p in processes:
         kernel.metrics.record_process(p)
 
+    if isinstance(policy, SchedulingPolicy):
+        # simulate() records exact slices, gaps left out
+        if gantt:
+            kernel.metrics.cpu_busy_time += sum(end - start for _, start, end in gantt)
+            kernel.metrics.total_time += gantt[-1][2]
+    elif processes:
+        # Legacy Gantt entries run until the next one starts, idle gaps
+        # included, so take the busy time from the processes instead
+        kernel.metrics.cpu_busy_time += sum(p.pcb.burst_time for p in processes)
+        kernel.metrics.total_time += max(p.pcb.completion_time for p in processes)
+
     return kernel.metrics.summary(), gantt
@@ -0,0 +1,88 @@
+"""
+Thrashing Experiment
+Throughput of multi-process memory workloads under each allocation policy
+"""
+
+import random
+
+from memory.allocation import FrameAllocator, WorkingSetAllocator, PFFAllocator
+from memory.virtual_memory import VirtualMemoryManager
+from process.process import Process
+
+PAGE_SIZE = 4096
+FAULT_SERVICE_TIME = 100    # time units per fault; a hit costs 1
+
+
+def locality_trace(length, pages=64, locality=8, phase=200, seed=0):
+    """
+    Reference string that stays inside a small set of `locality` pages
+    and moves to a new set every `phase` references
+    """
+    rng = random.Random(seed)
+    trace = []
+    while len(trace) < length:
+        current = rng.sample(range(pages), locality)
+        trace.extend(rng.choice(current) for _ in range(phase))
+    return trace[:length]
+
+
+def run(allocator, processes=4, frames=32, references=4000, quantum=50, seed=0):
+    """
+    Interleave per-process locality traces round-robin through one
+    VirtualMemoryManager. With an allocator that reports demand(), load
+    control runs only as many processes as their demands fit in memory
+    and swaps the rest out until those finish.
+
+    Returns:
+        dict: faults, fault_rate and throughput (references per time unit)
+    """
+    vm = VirtualMemoryManager(frames, allocator=allocator)
+    procs = [Process(pid, 0, references) for pid in range(processes)]
+    traces = [locality_trace(references, seed=seed * 1000 + pid) for pid in range(processes)]
+    done = [0] * processes
+
+    while any(n < references for n in done):
+        active = [p for p in procs if done[p.pcb.pid] < references]
+        running, demand = [], 0
+        for p in active:
+            need = allocator.demand(p.pcb.pid)
+            if need is None or not running or demand + need <= frames:
+                running.append(p)
+                demand += need or 0
+            elif p.pcb.page_table:
+                vm.suspend(p)
+
+        for p in running:
+            pid = p.pcb.pid
+            for page in traces[pid][done[pid]:done[pid] + quantum]:
+                vm.access(p, page * PAGE_SIZE, PAGE_SIZE)
+            done[pid] = min(done[pid] + quantum, references)
+            if done[pid] == references:
+                vm.free_process(p)
+
+    total = processes * references
+    time = total + vm.page_faults * FAULT_SERVICE_TIME
+    return {
+        "faults": vm.page_faults,
+        "fault_rate": vm.page_faults / total,
+        "throughput": total / time,
+    }
+
+
+def compare(max_processes=8, frames=32):
+    """Throughput per allocation policy as the multiprogramming degree grows"""
+    policies = {
+        "Global": FrameAllocator,
+        "WS": lambda: WorkingSetAllocator(window=40),
+        "PFF": lambda: PFFAllocator(initial=4, lower=10, upper=40),
+    }
+    return {
+        name: [run(policy(), processes=n, frames=frames)["throughput"]
+               for n in range(1, max_processes + 1)]
+        for name, policy in policies.items()
+    }
+
+
+if __name__ == "__main__":
+    for name, throughputs in compare().items():
+        print(f"{name:7s}", " ".join(f"{t:.3f}" for t in throughputs))
@@ -14,6 +14,7 @@ class Kernel:
         self.time = 0
         self.process_table = {}
         self.metrics = Metrics()
+        self.memory = None      # optional VirtualMemoryManager, for COW fork
         self.syscalls = SysCallHandler(self)
 
     def create_process(self, pid, arrival_time, burst_time, priority=5):
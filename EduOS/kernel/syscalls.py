@@ -18,8 +18,12 @@ class SysCallHandler:
         child.pcb.parent = parent_proc
         parent_proc.pcb.children.append(child)
 
-        # Copy page table (logical copy, not physical duplication)
-        child.pcb.page_table = parent_proc.pcb.page_table.copy()
+        if self.kernel.memory is not None:
+            # Copy-on-write: share the page table and frames
+            self.kernel.memory.fork(parent_proc, child)
+        else:
+            # Copy page table (logical copy, not physical duplication)
+            child.pcb.page_table = parent_proc.pcb.page_table.copy()
 
         return child
 
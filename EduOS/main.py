@@ -14,7 +14,12 @@ from scheduler.srtf import srtf
 from scheduler.preemptive_priority import preemptive_priority
 from memory.paging import PagingSystem
 from memory.page_replacement import fifo, lru, optimal
+from memory.page_replacement import (
+    FIFOPolicy, LRUPolicy, ClockPolicy, OPTPolicy, LFUPolicy, ARCPolicy,
+)
+from memory.stack_distance import lru_fault_curve, opt_fault_curve
 from deadlock.bankers import is_safe
+from deadlock.avoidance import Banker
 from utils.logger import Logger
 from utils.metrics import calculate_metrics
 
@@ -63,27 +68,33 @@ def demo_process_management():
     return processes, kernel
 
 
+def fresh_copies(processes):
+    """Copies of the workload, since schedulers consume remaining_time"""
+    return [Process(p.pcb.pid, p.pcb.arrival_time, p.pcb.burst_time, p.pcb.priority)
+            for p in processes]
+
+
 def demo_scheduling(processes):
     """Demonstrate CPU scheduling algorithms"""
     print_section("[2] CPU SCHEDULING ALGORITHMS")
     
     # FCFS Scheduling
-    fcfs_gantt, fcfs_stats = fcfs(processes)
+    fcfs_gantt, fcfs_stats = fcfs(fresh_copies(processes))
     print(f"FCFS Gantt Chart: {fcfs_gantt}")
     print(f"FCFS Statistics: {fcfs_stats}")
     
     # SJF Scheduling
-    sjf_gantt, sjf_stats = sjf(processes)
+    sjf_gantt, sjf_stats = sjf(fresh_copies(processes))
     print(f"\nSJF Gantt Chart: {sjf_gantt}")
     print(f"SJF Statistics: {sjf_stats}")
     
     # Priority Scheduling
-    priority_gantt, priority_stats = priority_scheduling(processes)
+    priority_gantt, priority_stats = priority_scheduling(fresh_copies(processes))
     print(f"\nPriority Gantt Chart: {priority_gantt}")
     print(f"Priority Statistics: {priority_stats}")
     
     # Round Robin Scheduling
-    rr_gantt, rr_stats = round_robin(processes, quantum=4)
+    rr_gantt, rr_stats = round_robin(fresh_copies(processes), quantum=4)
     print(f"\nRound Robin Gantt Chart: {rr_gantt}")
 
 
@@ -97,6 +108,20 @@ def demo_paging():
         paging.access_page(addr)
     print(f"Total Page Faults: {paging.page_faults}")
 
+    # Same references under each replacement policy
+    policies = {
+        "FIFO": FIFOPolicy(),
+        "LRU": LRUPolicy(),
+        "Clock": ClockPolicy(),
+        "OPT": OPTPolicy(virtual_addresses),
+        "LFU": LFUPolicy(),
+        "ARC": ARCPolicy(),
+    }
+    for name, policy in policies.items():
+        paging = PagingSystem(frames=4, policy=policy)
+        paging.access_many(virtual_addresses)
+        print(f"{name:<6} Page Faults: {paging.page_faults}, Hits: {paging.hits}")
+
 
 def demo_page_replacement():
     """Demonstrate page replacement algorithms"""
@@ -116,6 +141,10 @@ def demo_page_replacement():
     optimal_faults = optimal(page_sequence, frames=3)
     print(f"Optimal Page Faults: {optimal_faults}")
 
+    # Every frame count at once, from one pass over the sequence
+    print(f"LRU Faults for 1-5 Frames: {lru_fault_curve(page_sequence, 5)[1:]}")
+    print(f"Optimal Faults for 1-5 Frames: {opt_fault_curve(page_sequence, 5)[1:]}")
+
 
 def demo_deadlock_avoidance():
     """Demonstrate deadlock avoidance - Banker's algorithm"""
@@ -143,6 +172,12 @@ def demo_deadlock_avoidance():
     if safe:
         print(f"Safe Sequence: {sequence}")
 
+    # The same state, kept live: each request is checked before it is granted
+    banker = Banker(available, max_need, allocation, process_names)
+    print(f"P1 requests [1, 0, 2]: {'granted' if banker.request('P1', [1, 0, 2]) else 'denied'}")
+    print(f"P4 requests [3, 3, 0]: {'granted' if banker.request('P4', [3, 3, 0]) else 'denied'}")
+    print(f"P0 requests [0, 2, 0]: {'granted' if banker.request('P0', [0, 2, 0]) else 'denied'}")
+
 
 def demo_kernel_dispatch(kernel):
     """Demonstrate kernel status"""
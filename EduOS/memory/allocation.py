@@ -0,0 +1,127 @@
+"""
+Frame Allocation
+Local allocation policies that size each process's resident set
+"""
+
+from collections import deque
+
+
+class FrameAllocator:
+    """
+    Policy consulted by VirtualMemoryManager on every reference. The
+    default is global allocation: no quota and nothing released.
+    """
+
+    def on_access(self, pid, page, fault):
+        """
+        Record a reference; return pages that left the process's resident
+        set. They stay mapped but are the first to go when memory is short.
+        """
+        return ()
+
+    def quota(self, pid):
+        """Frames the process may hold before replacing its own, or None"""
+        return None
+
+    def demand(self, pid):
+        """Frames the process needs to run without thrashing, or None"""
+        return None
+
+    def on_fork(self, parent_pid, child_pid):
+        """A child starts out with its parent's address space"""
+
+    def on_exit(self, pid):
+        """Forget a process that has freed its memory"""
+
+
+class WorkingSetAllocator(FrameAllocator):
+    # The resident set is the pages referenced in each process's last
+    # `window` references. The window is a deque plus per-page counts, so a
+    # page leaves the working set in O(1) instead of rescanning the window.
+    def __init__(self, window=10):
+        self.window = window
+        self.references = {}    # pid -> deque of the last `window` pages
+        self.counts = {}        # pid -> page -> references in the window
+
+    def on_access(self, pid, page, fault):
+        references = self.references.get(pid)
+        if references is None:
+            references = self.references[pid] = deque()
+            self.counts[pid] = {}
+        counts = self.counts[pid]
+
+        references.append(page)
+        counts[page] = counts.get(page, 0) + 1
+        if len(references) <= self.window:
+            return ()
+
+        old = references.popleft()
+        counts[old] -= 1
+        if counts[old]:
+            return ()
+        del counts[old]
+        return (old,)
+
+    def on_fork(self, parent_pid, child_pid):
+        if parent_pid in self.references:
+            self.references[child_pid] = deque(self.references[parent_pid])
+            self.counts[child_pid] = dict(self.counts[parent_pid])
+
+    def working_set_size(self, pid):
+        return len(self.counts.get(pid, ()))
+
+    def demand(self, pid):
+        return self.working_set_size(pid)
+
+    def on_exit(self, pid):
+        self.references.pop(pid, None)
+        self.counts.pop(pid, None)
+
+
+class PFFAllocator(FrameAllocator):
+    # Page-fault frequency: measures each process's references between
+    # faults, gives it another frame when faults come closer together
+    # than `lower` and takes one away when they are further apart than
+    # `upper`
+    def __init__(self, initial=4, lower=5, upper=20, min_frames=1, max_frames=None):
+        self.initial = initial
+        self.lower = lower
+        self.upper = upper
+        self.min_frames = min_frames
+        self.max_frames = max_frames
+        self.quotas = {}        # pid -> frame quota
+        self.clock = {}         # pid -> references made (virtual time)
+        self.last_fault = {}    # pid -> virtual time of the previous fault
+
+    def on_access(self, pid, page, fault):
+        time = self.clock.get(pid, 0) + 1
+        self.clock[pid] = time
+        if not fault:
+            return ()
+
+        quota = self.quotas.get(pid, self.initial)
+        if pid in self.last_fault:
+            interval = time - self.last_fault[pid]
+            if interval < self.lower:
+                quota += 1
+                if self.max_frames is not None:
+                    quota = min(quota, self.max_frames)
+            elif interval > self.upper:
+                quota = max(self.min_frames, quota - 1)
+        self.quotas[pid] = quota
+        self.last_fault[pid] = time
+        return ()
+
+    def quota(self, pid):
+        return self.quotas.get(pid, self.initial)
+
+    def demand(self, pid):
+        return self.quota(pid)
+
+    def on_fork(self, parent_pid, child_pid):
+        self.quotas[child_pid] = self.quota(parent_pid)
+
+    def on_exit(self, pid):
+        self.quotas.pop(pid, None)
+        self.clock.pop(pid, None)
+        self.last_fault.pop(pid, None)
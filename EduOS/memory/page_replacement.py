@@ -3,56 +3,336 @@ Page Replacement Algorithms
 Implements various page replacement strategies
 """
 
-def fifo(pages, frames):
-    memory = []
+import heapq
+from array import array
+from collections import OrderedDict, deque
+
+def fifo(pages, frames, bitmap=False):
+    """
+    Args:
+        pages: Page reference string
+        frames: Number of physical frames
+        bitmap: Also return the per-access fault bitmap (1 = fault,
+            0 = hit) as an array('B')
+
+    Returns:
+        int: Page fault count, or (faults, bitmap) if bitmap is set
+    """
+    queue = deque()         # resident pages in load order
+    memory = set()
     faults = 0
+    fault_bits = array('B') if bitmap else None
 
     for page in pages:
         if page not in memory:
             faults += 1
-            if len(memory) < frames:
-                memory.append(page)
-            else:
-                memory.pop(0)
-                memory.append(page)
-    return faults
+            if len(memory) >= frames:
+                memory.remove(queue.popleft())
+            queue.append(page)
+            memory.add(page)
+            if bitmap:
+                fault_bits.append(1)
+        elif bitmap:
+            fault_bits.append(0)
+
+    return (faults, fault_bits) if bitmap else faults
 
 
-def lru(pages, frames):
-    memory = []
-    recent = {}
+def lru(pages, frames, bitmap=False):
+    """
+    Args:
+        pages: Page reference string
+        frames: Number of physical frames
+        bitmap: Also return the per-access fault bitmap (1 = fault,
+            0 = hit) as an array('B')
+
+    Returns:
+        int: Page fault count, or (faults, bitmap) if bitmap is set
+    """
+    memory = OrderedDict()  # resident pages, least recently used first
     faults = 0
+    fault_bits = array('B') if bitmap else None
 
-    for time, page in enumerate(pages):
-        if page not in memory:
+    for page in pages:
+        if page in memory:
+            memory.move_to_end(page)
+            if bitmap:
+                fault_bits.append(0)
+        else:
             faults += 1
-            if len(memory) < frames:
-                memory.append(page)
-            else:
-                lru_page = min(recent, key=recent.get)
-                memory.remove(lru_page)
-                del recent[lru_page]
-                memory.append(page)
-        recent[page] = time
-    return faults
+            if len(memory) >= frames:
+                memory.popitem(last=False)
+            memory[page] = None
+            if bitmap:
+                fault_bits.append(1)
+
+    return (faults, fault_bits) if bitmap else faults
+
+
+def next_use_indices(pages):
+    """
+    For every position i, the index of the next reference to pages[i]
+    (len(pages) if it is never referenced again), in one backward pass
+    """
+    n = len(pages)
+    next_use = array('q', bytes(8 * n))
+    last_seen = {}
+    for i in range(n - 1, -1, -1):
+        page = pages[i]
+        next_use[i] = last_seen.get(page, n)
+        last_seen[page] = i
+    return next_use
+
+
+def optimal(pages, frames, next_use=None):
+    """
+    Belady's OPT: evict the resident page whose next use is farthest away
+
+    Args:
+        pages: Page reference string; any iterable if next_use is given
+        frames: Number of physical frames
+        next_use: Optional precomputed next_use_indices(pages), as a
+            sequence or an iterable consumed alongside pages
 
+    Returns:
+        int: Page fault count
+    """
+    if next_use is None:
+        next_use = next_use_indices(pages)
 
-def optimal(pages, frames):
-    memory = []
+    resident = {}   # page -> index of its next use
+    heap = []       # (-next use, position, page); stale entries skipped
     faults = 0
 
+    uses = iter(next_use)
     for i, page in enumerate(pages):
-        if page not in memory:
+        page_next_use = next(uses, None)
+        if page_next_use is None:
+            raise ValueError(f"next_use ends after {i} entries, before the reference string")
+        if page not in resident:
             faults += 1
-            if len(memory) < frames:
-                memory.append(page)
-            else:
-                future = pages[i+1:]
-                index = {}
-                for m in memory:
-                    index[m] = future.index(m) if m in future else float('inf')
-                victim = max(index, key=index.get)
-                memory.remove(victim)
-                memory.append(page)
+            if len(resident) >= frames:
+                while True:
+                    use, _, victim = heapq.heappop(heap)
+                    if resident.get(victim) == -use:
+                        break
+                del resident[victim]
+
+        resident[page] = page_next_use
+        heapq.heappush(heap, (-page_next_use, i, page))
+
+        # Every hit leaves a stale entry behind; keep the heap O(frames)
+        if len(heap) > 2 * frames + 64:
+            heap = [(-use, 0, p) for p, use in resident.items()]
+            heapq.heapify(heap)
+
     return faults
 
+
+class ReplacementPolicy:
+    """
+    Victim selection for PagingSystem. Every access reaches the policy
+    exactly once, through on_hit or (after an evict if memory is full)
+    on_insert.
+    """
+
+    def on_hit(self, page):
+        """A resident page was referenced"""
+
+    def on_insert(self, page):
+        """A faulting page was loaded"""
+        raise NotImplementedError
+
+    def evict(self, page):
+        """Choose, forget and return the resident page to replace with page"""
+        raise NotImplementedError
+
+
+class FIFOPolicy(ReplacementPolicy):
+    def __init__(self):
+        self.queue = deque()    # resident pages in load order
+
+    def on_insert(self, page):
+        self.queue.append(page)
+
+    def evict(self, page):
+        return self.queue.popleft()
+
+
+class LRUPolicy(ReplacementPolicy):
+    def __init__(self):
+        self.order = OrderedDict()  # least recently used first
+
+    def on_hit(self, page):
+        self.order.move_to_end(page)
+
+    def on_insert(self, page):
+        self.order[page] = None
+
+    def evict(self, page):
+        return self.order.popitem(last=False)[0]
+
+
+class ClockPolicy(ReplacementPolicy):
+    # Second chance over a circular buffer of frames, like the clock in
+    # VirtualMemoryManager
+    def __init__(self):
+        self.slots = []         # page held by each frame
+        self.ref_bits = array('B')
+        self.slot_of = {}       # page -> frame index
+        self.hand = 0
+        self.free_slot = None   # frame emptied by the last evict
+
+    def on_hit(self, page):
+        self.ref_bits[self.slot_of[page]] = 1
+
+    def on_insert(self, page):
+        if self.free_slot is None:
+            slot = len(self.slots)
+            self.slots.append(page)
+            self.ref_bits.append(1)
+        else:
+            slot = self.free_slot
+            self.free_slot = None
+            self.slots[slot] = page
+            self.ref_bits[slot] = 1
+        self.slot_of[page] = slot
+
+    def evict(self, page):
+        while self.ref_bits[self.hand]:
+            self.ref_bits[self.hand] = 0
+            self.hand = (self.hand + 1) % len(self.slots)
+        slot = self.hand
+        self.hand = (slot + 1) % len(self.slots)
+        victim = self.slots[slot]
+        del self.slot_of[victim]
+        self.free_slot = slot
+        return victim
+
+
+class OPTPolicy(ReplacementPolicy):
+    # Needs the whole reference string up front, like optimal()
+    def __init__(self, pages, next_use=None):
+        self.next_use = next_use_indices(pages) if next_use is None else next_use
+        self.time = 0           # index of the current reference
+        self.resident = {}      # page -> index of its next use
+        self.heap = []          # (-next use, position, page); stale entries skipped
+
+    def _touch(self, page):
+        use = self.next_use[self.time]
+        self.resident[page] = use
+        heapq.heappush(self.heap, (-use, self.time, page))
+        self.time += 1
+        if len(self.heap) > 2 * len(self.resident) + 64:
+            self.heap = [(-use, 0, p) for p, use in self.resident.items()]
+            heapq.heapify(self.heap)
+
+    def on_hit(self, page):
+        self._touch(page)
+
+    def on_insert(self, page):
+        self._touch(page)
+
+    def evict(self, page):
+        while True:
+            use, _, victim = heapq.heappop(self.heap)
+            if self.resident.get(victim) == -use:
+                del self.resident[victim]
+                return victim
+
+
+class LFUPolicy(ReplacementPolicy):
+    # O(1) LFU: pages bucketed by reference count, least recently used
+    # first within a bucket
+    def __init__(self):
+        self.count = {}         # page -> references while resident
+        self.buckets = {}       # count -> OrderedDict of pages
+        self.min_count = 0
+
+    def on_hit(self, page):
+        count = self.count[page]
+        bucket = self.buckets[count]
+        del bucket[page]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        self.count[page] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[page] = None
+
+    def on_insert(self, page):
+        self.count[page] = 1
+        self.buckets.setdefault(1, OrderedDict())[page] = None
+        self.min_count = 1
+
+    def evict(self, page):
+        # Always followed by on_insert, which resets min_count
+        bucket = self.buckets[self.min_count]
+        victim = bucket.popitem(last=False)[0]
+        if not bucket:
+            del self.buckets[self.min_count]
+        del self.count[victim]
+        return victim
+
+
+class ARCPolicy(ReplacementPolicy):
+    # Adaptive Replacement Cache (Megiddo and Modha). T1/T2 hold resident
+    # pages seen once/more than once, B1/B2 remember pages recently evicted
+    # from each, and p is the adaptive target size of T1. The capacity is
+    # learned at the first eviction unless given.
+    def __init__(self, capacity=None):
+        self.capacity = capacity
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    def on_hit(self, page):
+        if page in self.t1:
+            del self.t1[page]
+            self.t2[page] = None
+        else:
+            self.t2.move_to_end(page)
+
+    def on_insert(self, page):
+        # Pages remembered in a ghost list have been seen before
+        if page in self.b1:
+            del self.b1[page]
+            self.t2[page] = None
+        elif page in self.b2:
+            del self.b2[page]
+            self.t2[page] = None
+        else:
+            self.t1[page] = None
+
+    def _replace(self, page):
+        t1 = len(self.t1)
+        if t1 and (not self.t2 or t1 > self.p or (page in self.b2 and t1 == self.p)):
+            victim = self.t1.popitem(last=False)[0]
+            self.b1[victim] = None
+        else:
+            victim = self.t2.popitem(last=False)[0]
+            self.b2[victim] = None
+        return victim
+
+    def evict(self, page):
+        c = self.capacity
+        if c is None:
+            c = self.capacity = len(self.t1) + len(self.t2)
+
+        if page in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) / len(self.b1), 1))
+            return self._replace(page)
+        if page in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) / len(self.b2), 1))
+            return self._replace(page)
+
+        if len(self.t1) + len(self.b1) >= c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                return self._replace(page)
+            return self.t1.popitem(last=False)[0]
+        if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * c:
+            self.b2.popitem(last=False)
+        return self._replace(page)
@@ -0,0 +1,237 @@
+"""
+Page Table Formats
+Alternatives to the flat dict page table for sparse address spaces
+"""
+
+from array import array
+from collections.abc import MutableMapping
+
+EMPTY = -1      # unmapped slot in a frame array
+
+
+class TwoLevelPageTable(MutableMapping):
+    """
+    Radix page table: a sparse directory of second-level arrays, each
+    covering 2**bits consecutive pages. Only touched regions allocate
+    a second level, and a second level is released once it empties.
+    """
+
+    def __init__(self, bits=10):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.directory = {}     # top-level index -> array('i') of frames
+        self.used = {}          # top-level index -> mapped entries in it
+        self.count = 0
+
+    def get(self, page, default=None):
+        table = self.directory.get(page >> self.bits)
+        if table is None:
+            return default
+        frame = table[page & self.mask]
+        return default if frame == EMPTY else frame
+
+    def __getitem__(self, page):
+        frame = self.get(page)
+        if frame is None:
+            raise KeyError(page)
+        return frame
+
+    def __setitem__(self, page, frame):
+        index = page >> self.bits
+        table = self.directory.get(index)
+        if table is None:
+            table = self.directory[index] = array('i', [EMPTY]) * (self.mask + 1)
+            self.used[index] = 0
+        if table[page & self.mask] == EMPTY:
+            self.used[index] += 1
+            self.count += 1
+        table[page & self.mask] = frame
+
+    def __delitem__(self, page):
+        index = page >> self.bits
+        table = self.directory.get(index)
+        if table is None or table[page & self.mask] == EMPTY:
+            raise KeyError(page)
+        table[page & self.mask] = EMPTY
+        self.count -= 1
+        self.used[index] -= 1
+        if self.used[index] == 0:
+            del self.directory[index]
+            del self.used[index]
+
+    def __iter__(self):
+        for index, table in self.directory.items():
+            base = index << self.bits
+            for offset, frame in enumerate(table):
+                if frame != EMPTY:
+                    yield base + offset
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.directory.clear()
+        self.used.clear()
+        self.count = 0
+
+    def copy(self):
+        clone = TwoLevelPageTable(self.bits)
+        clone.directory = {index: table[:] for index, table in self.directory.items()}
+        clone.used = dict(self.used)
+        clone.count = self.count
+        return clone
+
+    def node(self, page):
+        """Second-level array holding the page's entry, or None"""
+        return self.directory.get(page >> self.bits)
+
+    def nodes(self):
+        return self.directory.values()
+
+    def share(self):
+        """
+        Copy that shares the second-level arrays with this table, in
+        O(arrays) instead of O(pages). Neither table may then change a
+        shared array in place: unshare() its page first.
+        """
+        clone = TwoLevelPageTable(self.bits)
+        clone.directory = dict(self.directory)
+        clone.used = dict(self.used)
+        clone.count = self.count
+        return clone
+
+    def unshare(self, page):
+        """Give this table its own copy of the page's second-level array"""
+        index = page >> self.bits
+        table = self.directory[index] = self.directory[index][:]
+        return table
+
+
+# Key markers for HashedPageTable slots; real page numbers are never this low
+FREE_SLOT = -(1 << 63)
+DELETED_SLOT = FREE_SLOT + 1
+
+# Fibonacci hashing spreads runs of consecutive pages over the table,
+# which keeps linear probe sequences short
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
+
+class HashedPageTable(MutableMapping):
+    """
+    Open-addressing hash table with linear probing, stored in two flat
+    arrays (page keys and frames) instead of a dict of int objects
+    """
+
+    def __init__(self, capacity=8):
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.keys = array('q', [FREE_SLOT]) * capacity
+        self.frames = array('i', [EMPTY]) * capacity
+        self.mask = capacity - 1
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.count = 0
+        self.filled = 0     # live entries plus deleted markers
+
+    def _hash(self, page):
+        return ((page * HASH_MULTIPLIER) & HASH_MASK) >> self.shift
+
+    def _find(self, page):
+        # Slot holding the page, or -1
+        keys = self.keys
+        mask = self.mask
+        i = ((page * HASH_MULTIPLIER) & HASH_MASK) >> self.shift
+        while True:
+            key = keys[i]
+            if key == page:
+                return i
+            if key == FREE_SLOT:
+                return -1
+            i = (i + 1) & mask
+
+    def get(self, page, default=None):
+        i = self._find(page)
+        return default if i < 0 else self.frames[i]
+
+    def __getitem__(self, page):
+        i = self._find(page)
+        if i < 0:
+            raise KeyError(page)
+        return self.frames[i]
+
+    def __setitem__(self, page, frame):
+        i = self._find(page)
+        if i >= 0:
+            self.frames[i] = frame
+            return
+
+        # Keep the load (deleted markers included) under two thirds
+        if 3 * (self.filled + 1) > 2 * len(self.keys):
+            self._resize()
+
+        keys = self.keys
+        i = self._hash(page)
+        while keys[i] != FREE_SLOT and keys[i] != DELETED_SLOT:
+            i = (i + 1) & self.mask
+        if keys[i] == FREE_SLOT:
+            self.filled += 1
+        keys[i] = page
+        self.frames[i] = frame
+        self.count += 1
+
+    def _resize(self):
+        # Grow if mostly live, otherwise just drop the deleted markers
+        capacity = len(self.keys)
+        if 2 * self.count >= capacity // 2:
+            capacity *= 2
+        keys, frames = self.keys, self.frames
+        self._allocate(capacity)
+        for page, frame in zip(keys, frames):
+            if page != FREE_SLOT and page != DELETED_SLOT:
+                self[page] = frame
+
+    def __delitem__(self, page):
+        i = self._find(page)
+        if i < 0:
+            raise KeyError(page)
+        self.keys[i] = DELETED_SLOT
+        self.count -= 1
+
+    def __iter__(self):
+        for key in self.keys:
+            if key != FREE_SLOT and key != DELETED_SLOT:
+                yield key
+
+    def items(self):
+        return [(key, frame) for key, frame in zip(self.keys, self.frames)
+                if key != FREE_SLOT and key != DELETED_SLOT]
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self._allocate(8)
+
+    def copy(self):
+        clone = HashedPageTable.__new__(HashedPageTable)
+        clone.keys = self.keys[:]
+        clone.frames = self.frames[:]
+        clone.mask = self.mask
+        clone.shift = self.shift
+        clone.count = self.count
+        clone.filled = self.filled
+        return clone
+
+
+PAGE_TABLE_FORMATS = {
+    "flat": dict,
+    "two_level": TwoLevelPageTable,
+    "hashed": HashedPageTable,
+}
+
+
+def new_page_table(kind="flat"):
+    if kind not in PAGE_TABLE_FORMATS:
+        raise ValueError(f"unknown page table format: {kind}")
+    return PAGE_TABLE_FORMATS[kind]()
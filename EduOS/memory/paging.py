@@ -3,17 +3,70 @@ Memory Paging Module
 Implements virtual memory paging
 """
 
+from memory.page_replacement import FIFOPolicy
+
 class PagingSystem:
-    def __init__(self, frames):
+    def __init__(self, frames, policy=None):
         self.frames = frames
-        self.memory = []
+        self.policy = policy if policy is not None else FIFOPolicy()
+        self.memory = {}        # resident page -> frame
         self.page_faults = 0
+        self.hits = 0
 
     def access_page(self, page):
-        if page not in self.memory:
-            self.page_faults += 1
-            if len(self.memory) < self.frames:
-                self.memory.append(page)
+        """Reference one page; returns True on a hit, False on a page fault"""
+        if page in self.memory:
+            self.hits += 1
+            self.policy.on_hit(page)
+            return True
+
+        self.page_faults += 1
+        if len(self.memory) < self.frames:
+            frame = len(self.memory)
+        else:
+            frame = self.memory.pop(self.policy.evict(page))
+        self.memory[page] = frame
+        self.policy.on_insert(page)
+        return False
+
+    def access_many(self, pages):
+        """
+        Reference every page of an iterable (a list, a NumPy array or a
+        stream such as memory.trace.iter_pages(...))
+
+        Returns:
+            int: Page faults among these accesses
+        """
+        if hasattr(pages, "tolist"):
+            pages = pages.tolist()
+
+        memory = self.memory
+        policy = self.policy
+        faults = self.page_faults
+        hits = 0
+        for page in pages:
+            if page in memory:
+                hits += 1
+                policy.on_hit(page)
+                continue
+            faults += 1
+            if len(memory) < self.frames:
+                frame = len(memory)
             else:
-                return False  # Page fault, replacement needed
-        return True
\ No newline at end of file
+                frame = memory.pop(policy.evict(page))
+            memory[page] = frame
+            policy.on_insert(page)
+
+        new_faults = faults - self.page_faults
+        self.page_faults = faults
+        self.hits += hits
+        return new_faults
+
+    def stats(self):
+        accesses = self.hits + self.page_faults
+        return {
+            "policy": type(self.policy).__name__,
+            "hits": self.hits,
+            "page_faults": self.page_faults,
+            "hit_ratio": self.hits / accesses if accesses else 0,
+        }
@@ -0,0 +1,143 @@
+"""
+Stack Distance Analysis
+Fault counts for every frame count from a single pass over the trace
+"""
+
+from array import array
+from memory.page_replacement import next_use_indices
+
+# Distance recorded for a reference that misses at every frame count
+MISS = 0
+
+
+class FenwickTree:
+    """Binary indexed tree over positions 1..size, for prefix sums"""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = array('q', bytes(8 * (size + 1)))
+
+    def add(self, i, delta):
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, i):
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+def lru_stack_distances(pages):
+    """
+    LRU stack distance of every reference: the number of distinct pages
+    touched since the previous reference to the same page, itself
+    included. A reference hits with f frames exactly when its distance
+    is between 1 and f; first references get MISS.
+
+    The tree holds a 1 at the most recent position of every page, so a
+    distance is one range sum, O(log N) per reference.
+    """
+    n = len(pages)
+    distances = array('q', bytes(8 * n))
+    tree = FenwickTree(n)
+    last_access = {}
+
+    for i, page in enumerate(pages, start=1):
+        last = last_access.get(page)
+        if last is not None:
+            distances[i - 1] = tree.prefix_sum(i - 1) - tree.prefix_sum(last) + 1
+            tree.add(last, -1)
+        tree.add(i, 1)
+        last_access[page] = i
+
+    return distances
+
+
+def opt_stack_distances(pages, max_frames, next_use=None):
+    """
+    OPT stack distance of every reference, using Mattson's priority
+    stack with the next use as priority. Only the top max_frames entries
+    are kept, so deeper references get MISS. Each reference costs O(d)
+    for a hit at depth d and O(max_frames) for a miss.
+
+    Args:
+        pages: Page reference string
+        max_frames: Largest frame count of interest
+        next_use: Optional precomputed next_use_indices(pages)
+    """
+    if next_use is None:
+        next_use = next_use_indices(pages)
+
+    distances = array('q', bytes(8 * len(pages)))
+    stack = []
+    resident = set()
+    priority = {}   # page -> index of its next use, sooner ranks higher
+
+    for i, page in enumerate(pages):
+        if page in resident:
+            depth = stack.index(page) + 1
+            distances[i] = depth
+        else:
+            depth = None
+
+        priority[page] = next_use[i]
+        if depth == 1:
+            continue
+
+        # The referenced page goes on top; each displaced page moves down
+        # until it meets a slot whose page it outranks or the gap left by
+        # the referenced page
+        carry = stack[0] if stack else None
+        if stack:
+            stack[0] = page
+        end = depth - 1 if depth is not None else len(stack)
+        for k in range(1, end):
+            if priority[stack[k]] > priority[carry]:
+                stack[k], carry = carry, stack[k]
+
+        if depth is not None:
+            stack[depth - 1] = carry
+            continue
+
+        resident.add(page)
+        if not stack:
+            stack.append(page)
+        elif len(stack) < max_frames:
+            stack.append(carry)
+        else:
+            resident.discard(carry)
+            del priority[carry]
+
+    return distances
+
+
+def fault_curve(distances, max_frames):
+    """
+    Fault counts from stack distances
+
+    Returns:
+        list: curve[f] is the number of faults with f frames, for
+        f = 0..max_frames
+    """
+    hits = [0] * (max_frames + 1)
+    for d in distances:
+        if d != MISS and d <= max_frames:
+            hits[d] += 1
+
+    curve = [len(distances)]
+    for f in range(1, max_frames + 1):
+        curve.append(curve[-1] - hits[f])
+    return curve
+
+
+def lru_fault_curve(pages, max_frames):
+    """LRU fault count for every frame count 0..max_frames, in one pass"""
+    return fault_curve(lru_stack_distances(pages), max_frames)
+
+
+def opt_fault_curve(pages, max_frames, next_use=None):
+    """OPT fault count for every frame count 0..max_frames, in one pass"""
+    return fault_curve(opt_stack_distances(pages, max_frames, next_use), max_frames)
@@ -0,0 +1,88 @@
+"""
+Translation Lookaside Buffer
+Set-associative cache of page -> frame translations
+"""
+
+import random
+from collections import OrderedDict
+
+
+class TLB:
+    def __init__(self, entries=16, associativity=None, replacement="lru", asid=True, seed=None):
+        """
+        Args:
+            entries: Total number of translations held
+            associativity: Entries per set, None for fully associative
+            replacement: "lru" or "random" victim within a set
+            asid: Tag entries with the pid; otherwise the whole TLB is
+                flushed whenever a different pid translates
+            seed: Seed for random replacement
+        """
+        ways = entries if associativity is None else associativity
+        if ways <= 0 or entries % ways:
+            raise ValueError("entries must be a positive multiple of associativity")
+        if replacement not in ("lru", "random"):
+            raise ValueError(f"unknown TLB replacement: {replacement}")
+
+        self.ways = ways
+        self.num_sets = entries // ways
+        self.replacement = replacement
+        self.asid = asid
+        self.rng = random.Random(seed)
+        # Each set maps (pid, page) -> frame, least recently used first
+        self.sets = [OrderedDict() for _ in range(self.num_sets)]
+        self.current_pid = None
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+    def _set(self, page):
+        return self.sets[page % self.num_sets]
+
+    def lookup(self, pid, page):
+        """Cached frame for the page, or None on a TLB miss"""
+        if pid != self.current_pid:
+            # Context switch: untagged entries belong to the old process
+            if not self.asid and self.current_pid is not None:
+                self.flush()
+            self.current_pid = pid
+
+        entries = self._set(page)
+        frame = entries.get((pid, page))
+        if frame is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.replacement == "lru":
+            entries.move_to_end((pid, page))
+        return frame
+
+    def insert(self, pid, page, frame):
+        entries = self._set(page)
+        if (pid, page) not in entries and len(entries) >= self.ways:
+            if self.replacement == "lru":
+                entries.popitem(last=False)
+            else:
+                del entries[self.rng.choice(list(entries))]
+        entries[(pid, page)] = frame
+
+    def invalidate(self, pid, page):
+        """Drop one translation, e.g. when its frame is evicted"""
+        self._set(page).pop((pid, page), None)
+
+    def invalidate_pid(self, pid):
+        """Drop every translation of one process"""
+        for entries in self.sets:
+            for key in [key for key in entries if key[0] == pid]:
+                del entries[key]
+
+    def flush(self):
+        self.flushes += 1
+        for entries in self.sets:
+            entries.clear()
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
@@ -0,0 +1,83 @@
+"""
+Memory Traces
+Chunked readers for reference traces too large to hold in memory
+"""
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+TRACE_DTYPE = "<i8"     # little-endian int64, one reference per entry
+
+
+def write_trace(path, pages, dtype=TRACE_DTYPE):
+    """Store a reference string as a binary trace of fixed-width integers"""
+    np.asarray(pages, dtype=dtype).tofile(path)
+
+
+def open_trace(path, dtype=TRACE_DTYPE):
+    """Memory-map a binary trace; pages are read from disk on demand"""
+    try:
+        return np.memmap(path, dtype=dtype, mode="r")
+    except ValueError:
+        # An empty file cannot be mapped
+        return np.empty(0, dtype=dtype)
+
+
+def read_binary_trace(path, dtype=TRACE_DTYPE, chunk_size=CHUNK_SIZE):
+    """
+    Yield a binary trace as NumPy arrays of at most chunk_size entries.
+    The chunks are views of the mapping, so memory use does not grow
+    with the trace length.
+    """
+    trace = open_trace(path, dtype)
+    for start in range(0, len(trace), chunk_size):
+        yield np.asarray(trace[start:start + chunk_size])
+
+
+def read_text_trace(path, chunk_size=CHUNK_SIZE):
+    """Yield a whitespace-separated text trace as int64 NumPy arrays"""
+    values = []
+    with open(path) as f:
+        for line in f:
+            values.extend(line.split())
+            while len(values) >= chunk_size:
+                yield np.array(values[:chunk_size], dtype=np.int64)
+                del values[:chunk_size]
+    if values:
+        yield np.array(values, dtype=np.int64)
+
+
+def iter_pages(chunks):
+    """
+    Flatten chunks into plain ints, for the engines in page_replacement.py,
+    e.g. lru(iter_pages(read_binary_trace(path)), frames)
+    """
+    for chunk in chunks:
+        yield from chunk.tolist()
+
+
+def write_next_use(trace_path, next_use_path, dtype=TRACE_DTYPE, chunk_size=CHUNK_SIZE):
+    """
+    Precompute next_use_indices() for a binary trace into a second int64
+    file, one backward pass over the mapping. Only the last position of
+    every distinct page is kept in memory. Stream both files into
+    optimal(iter_pages(...), frames, next_use=iter_pages(...)).
+    """
+    trace = open_trace(trace_path, dtype)
+    n = len(trace)
+    if n == 0:
+        open(next_use_path, "wb").close()
+        return
+
+    next_use = np.memmap(next_use_path, dtype=TRACE_DTYPE, mode="w+", shape=n)
+    last_seen = {}
+    for end in range(n, 0, -chunk_size):
+        start = max(0, end - chunk_size)
+        pages = trace[start:end].tolist()
+        uses = [0] * len(pages)
+        for i in range(len(pages) - 1, -1, -1):
+            page = pages[i]
+            uses[i] = last_seen.get(page, n)
+            last_seen[page] = start + i
+        next_use[start:end] = uses
+    next_use.flush()
@@ -1,56 +1,545 @@
+from array import array
+from collections import deque
+from memory.page_table import new_page_table, EMPTY
+
+FREE = -1   # frame_owner value of an unused frame
+
+
 class VirtualMemoryManager:
-    def __init__(self, total_frames):
+    def __init__(self, total_frames, tlb=None, metrics=None, page_table_format="flat",
+                 allocator=None):
         self.total_frames = total_frames
-        self.frames = [None] * total_frames     # (pid, page)
-        self.ref_bits = [0] * total_frames
+        self.page_table_format = page_table_format
+        self.page_table_type = type(new_page_table(page_table_format))
+        self.tlb = tlb              # optional TLB in front of the page tables
+        self.metrics = metrics      # optional Metrics to report accesses to
+        self.allocator = allocator  # optional FrameAllocator for local allocation
+
+        # Frame table, one compact column per field
+        self.frame_owner = array('i', [FREE]) * total_frames   # node id
+        self.frame_refs = array('i', [0]) * total_frames       # nodes mapping it
+        self.frame_page = array('q', [0]) * total_frames
+        self.ref_bits = array('B', [0]) * total_frames
         self.clock_hand = 0
 
+        # Frames mapped by more than one node -> ids of all of them
+        self.frame_sharers = {}
+
+        # Free frames, popped lowest-numbered first
+        self.free_frames = array('i', range(total_frames - 1, -1, -1))
+
+        # Page tables are shared after fork until one side changes them
+        self.process_tables = {}    # pid -> page table
+        self.tables = {}            # table id -> page table
+        self.table_pids = {}        # table id -> pids using the table
+        self.table_ids = {}         # id(page table) -> table id
+        self.next_table_id = 0
+
+        # Frames are mapped per node: a second-level array of a two-level
+        # table, or the whole table in the other formats. A copy of a
+        # two-level table shares its arrays until one side changes them.
+        self.node_sharing = hasattr(self.page_table_type, "share")
+        self.nodes = {}             # node id -> node
+        self.node_ids = {}          # id(node) -> node id
+        self.node_tables = {}       # node id -> ids of the page tables holding it
+        self.next_node_id = 0
+
+        # Local allocation bookkeeping, kept only with an allocator
+        self.table_frames = {}      # table id -> frames it maps
+        self.local_rings = {}       # table id -> clock ring of (frame, page)
+        # Pages that left their process's resident set: table id -> page ->
+        # frame, oldest first. They stay mapped, so a re-reference is a
+        # hit, but are the first frames taken once memory runs out.
+        self.inactive = {}
+
         self.page_faults = 0
+        self.cow_faults = 0
+        self.frames_scanned = 0     # frames examined by clock sweeps
 
-    def _replace_page(self, process, page):
+    def _replace_page(self):
+        # Clock sweep; returns the victim frame, already unmapped
+        scanned = 0
         while True:
-            if self.ref_bits[self.clock_hand] == 0:
-                victim = self.frames[self.clock_hand]
-                if victim:
-                    victim_pid, victim_page = victim
-                    process_map = self.process_tables[victim_pid]
-                    del process_map[victim_page]
-
-                self.frames[self.clock_hand] = (process.pcb.pid, page)
-                self.ref_bits[self.clock_hand] = 1
-                frame = self.clock_hand
-                self.clock_hand = (self.clock_hand + 1) % self.total_frames
-                return frame
-            else:
-                self.ref_bits[self.clock_hand] = 0
-                self.clock_hand = (self.clock_hand + 1) % self.total_frames
+            frame = self.clock_hand
+            self.clock_hand = (frame + 1) % self.total_frames
+            scanned += 1
+            if self.ref_bits[frame] == 0:
+                break
+            self.ref_bits[frame] = 0
+
+        self.frames_scanned += scanned
+        page = self.frame_page[frame]
+        while self.frame_refs[frame]:
+            sharers = self.frame_sharers.get(frame)
+            node_id = sharers[0] if sharers else self.frame_owner[frame]
+            self._drop_page(next(iter(self.node_tables[node_id])), page, frame)
+        return frame
+
+    def _allocate_frame(self, process=None):
+        # Take a free frame, or evict one: locally under an allocator, with
+        # the global clock otherwise
+        if self.free_frames:
+            return self.free_frames.pop()
+        if self.allocator is not None and process is not None and self._reclaim(process):
+            return self.free_frames.pop()
+        return self._replace_page()
+
+    def _reclaim(self, process):
+        # Free a frame without taking one from another process's resident
+        # set: first pages that left a resident set, then a process over
+        # its quota, then, if it has a quota, the faulting process itself.
+        # Returns whether a frame is now free; if not, the global clock
+        # decides.
+        for tid, pages in self.inactive.items():
+            page_table = self.tables[tid]
+            while pages and not self.free_frames:
+                page = next(iter(pages))
+                frame = pages.pop(page)
+                if page_table.get(page) == frame:
+                    self._unmap_page(tid, page, frame)
+            if self.free_frames:
+                return True
+
+        for tid, pids in self.table_pids.items():
+            quota = self.allocator.quota(next(iter(pids)))
+            while (quota is not None and self.table_frames[tid] > quota
+                   and not self.free_frames and self._evict_local(tid)):
+                pass
+            if self.free_frames:
+                return True
+
+        if self.allocator.quota(process.pcb.pid) is None:
+            return False
+        tid = self.table_ids[id(self._private_table(process))]
+        while not self.free_frames and self._evict_local(tid):
+            pass
+        return bool(self.free_frames)
+
+    def _map(self, frame, node_id):
+        refs = self.frame_refs[frame]
+        if refs == 0:
+            self.frame_owner[frame] = node_id
+        elif refs == 1:
+            self.frame_sharers[frame] = [self.frame_owner[frame], node_id]
+        else:
+            self.frame_sharers[frame].append(node_id)
+        self.frame_refs[frame] = refs + 1
+
+    def _unmap(self, frame, node_id):
+        refs = self.frame_refs[frame] - 1
+        self.frame_refs[frame] = refs
+        if refs == 0:
+            return
+        sharers = self.frame_sharers[frame]
+        sharers.remove(node_id)
+        if refs == 1:
+            self.frame_owner[frame] = sharers[0]
+            del self.frame_sharers[frame]
+
+    def _node(self, page_table, page):
+        return page_table.node(page) if self.node_sharing else page_table
+
+    def _nodes(self, page_table):
+        return list(page_table.nodes()) if self.node_sharing else [page_table]
+
+    def _node_frames(self, node):
+        if self.node_sharing:
+            return [frame for frame in node if frame != EMPTY]
+        return node.values()
+
+    def _add_node(self, node, tid):
+        # Table tid holds the node; a node seen for the first time maps
+        # its frames
+        node_id = self.node_ids.get(id(node))
+        if node_id is None:
+            node_id = self.next_node_id
+            self.next_node_id += 1
+            self.node_ids[id(node)] = node_id
+            self.nodes[node_id] = node
+            self.node_tables[node_id] = set()
+            for frame in self._node_frames(node):
+                self._map(frame, node_id)
+        self.node_tables[node_id].add(tid)
+        return node_id
+
+    def _remove_node(self, node, tid):
+        # Table tid no longer holds the node; returns the frames that
+        # nothing maps any more once no table holds it
+        node_id = self.node_ids[id(node)]
+        tables = self.node_tables[node_id]
+        tables.discard(tid)
+        if tables:
+            return []
+        del self.node_ids[id(node)], self.nodes[node_id], self.node_tables[node_id]
+        released = []
+        for frame in self._node_frames(node):
+            self._unmap(frame, node_id)
+            if self.frame_refs[frame] == 0:
+                released.append(frame)
+        return released
+
+    def _private_node(self, tid, page):
+        # Id of the node holding the page in table tid, or None; a node
+        # other tables share is copied first, so it can be changed
+        page_table = self.tables[tid]
+        node = self._node(page_table, page)
+        if node is None:
+            return None
+        node_id = self.node_ids[id(node)]
+        if len(self.node_tables[node_id]) > 1:
+            self.node_tables[node_id].discard(tid)
+            node_id = self._add_node(page_table.unshare(page), tid)
+        return node_id
+
+    def _register(self, pid, page_table, source=None):
+        # source: id of the table this one was copied from, whose local
+        # allocation bookkeeping it inherits
+        tid = self.table_ids.get(id(page_table))
+        if tid is None:
+            tid = self.next_table_id
+            self.next_table_id += 1
+            self.table_ids[id(page_table)] = tid
+            self.tables[tid] = page_table
+            self.table_pids[tid] = set()
+            # Entries it already has (e.g. copied by a fork that did not go
+            # through this manager) share their frames; nodes it shares with
+            # a registered table only gain a holder
+            for node in self._nodes(page_table):
+                self._add_node(node, tid)
+            if self.allocator is not None:
+                self.table_frames[tid] = len(page_table)
+                if source is None:
+                    self.local_rings[tid] = deque(
+                        (frame, page) for page, frame in page_table.items())
+                else:
+                    self.local_rings[tid] = deque(self.local_rings[source])
+                    if source in self.inactive:
+                        self.inactive[tid] = dict(self.inactive[source])
+        self.table_pids[tid].add(pid)
+        self.process_tables[pid] = page_table
+        return tid
+
+    def _detach(self, pid):
+        # Drop the process from its page table, releasing the table and any
+        # frames nobody else maps once its last user is gone. Returns
+        # whether the table was released.
+        page_table = self.process_tables.pop(pid)
+        tid = self.table_ids[id(page_table)]
+        pids = self.table_pids[tid]
+        pids.discard(pid)
+        if pids:
+            return False
+
+        released = []
+        for node in self._nodes(page_table):
+            released.extend(self._remove_node(node, tid))
+        # Highest first, so the stack still hands out low frames first
+        for frame in sorted(released, reverse=True):
+            self.frame_owner[frame] = FREE
+            self.ref_bits[frame] = 0
+            self.free_frames.append(frame)
+
+        del self.tables[tid]
+        del self.table_pids[tid]
+        del self.table_ids[id(page_table)]
+        self.table_frames.pop(tid, None)
+        self.local_rings.pop(tid, None)
+        self.inactive.pop(tid, None)
+        return True
 
     def attach_process_tables(self, process_tables):
-        # pid -> page_table
-        self.process_tables = process_tables
+        # pid -> page_table; optional, tables are also registered on access
+        for pid, page_table in process_tables.items():
+            if self.process_tables.get(pid) is not page_table:
+                if pid in self.process_tables:
+                    self._detach(pid)
+                self._register(pid, page_table)
+
+    def fork(self, parent, child):
+        """
+        Give the child the parent's address space, copy-on-write. The page
+        table itself is shared, so this is O(1); the first change either
+        side makes copies the table, and the first write to a shared frame
+        copies the frame. A two-level table is copied a second-level array
+        at a time, when that array is first changed.
+        """
+        page_table = parent.pcb.page_table
+        if self.process_tables.get(parent.pcb.pid) is not page_table:
+            page_table = self._adopt(parent)
+        if child.pcb.pid in self.process_tables:
+            self._detach(child.pcb.pid)
+        child.pcb.page_table = page_table
+        self._register(child.pcb.pid, page_table)
+        if self.allocator is not None:
+            self.allocator.on_fork(parent.pcb.pid, child.pcb.pid)
+
+    def free_process(self, process):
+        """Return every frame of an exiting process to the free list"""
+        pid = process.pcb.pid
+        if pid in self.process_tables and not self._detach(pid):
+            # Still shared with a forked relative
+            process.pcb.page_table = new_page_table(self.page_table_format)
+        else:
+            process.pcb.page_table.clear()
+        if self.tlb is not None:
+            self.tlb.invalidate_pid(pid)
+        if self.allocator is not None:
+            self.allocator.on_exit(pid)
+
+    def _translate(self, process, page, write=False):
+        # Frame holding the page, faulting it in if needed
+        pid = process.pcb.pid
+        tlb = self.tlb
+        fault = False
+
+        # TLB hit: no page-table walk
+        frame = tlb.lookup(pid, page) if tlb is not None else None
+        tlb_hit = frame is not None
 
-    def access(self, process, logical_address, page_size):
+        if frame is None:
+            frame = process.pcb.page_table.get(page)
+
+        if self.allocator is not None:
+            # Pages that left the process's resident set become reclaimable
+            inactive = self.inactive.get(self.table_ids.get(id(process.pcb.page_table)))
+            if frame is not None and inactive:
+                inactive.pop(page, None)
+            for old in self.allocator.on_access(pid, page, frame is None):
+                self._deactivate(process, old)
+
+        if not tlb_hit:
+            if frame is None:
+                # Page fault
+                self.page_faults += 1
+                fault = True
+                if self.allocator is not None:
+                    self._make_room(process)
+                frame = self._allocate_frame(process)
+                page_table = self._private_table(process)
+                self._map_page(page_table, page, frame)
+            if tlb is not None:
+                tlb.insert(pid, page, frame)
+
+        if write and not fault and self._shared(process, page, frame):
+            frame = self._copy_on_write(process, page, frame)
+
+        self.ref_bits[frame] = 1
+        self._record(fault=fault, tlb_hit=tlb_hit)
+        return frame, fault
+
+    def _make_room(self, process):
+        # Under a quota, a faulting process replaces one of its own pages
+        quota = self.allocator.quota(process.pcb.pid)
+        if quota is None:
+            return
+        tid = self.table_ids[id(self._private_table(process))]
+        while self.table_frames[tid] >= quota and self._evict_local(tid):
+            pass
+
+    def _evict_local(self, tid):
+        # Clock over the frames of one page table; entries whose mapping has
+        # changed since they were queued are dropped on the way
+        ring = self.local_rings[tid]
+        page_table = self.tables[tid]
+        while ring:
+            frame, page = ring.popleft()
+            if page_table.get(page) != frame:
+                continue
+            if self.ref_bits[frame]:
+                self.ref_bits[frame] = 0
+                ring.append((frame, page))
+                continue
+            self._unmap_page(tid, page, frame)
+            return True
+        return False
+
+    def _deactivate(self, process, page):
+        page_table = process.pcb.page_table
+        frame = page_table.get(page)
+        tid = self.table_ids.get(id(page_table))
+        if frame is not None and tid is not None:
+            self.inactive.setdefault(tid, {})[page] = frame
+
+    def suspend(self, process):
+        """
+        Swap a process out: free every frame it maps (shared frames stay
+        with their other users) but keep its allocator state, so it can
+        be resumed later by simply running it again
+        """
+        page_table = self._private_table(process)
+        tid = self.table_ids[id(page_table)]
+        for page, frame in list(page_table.items()):
+            self._unmap_page(tid, page, frame)
+
+    def _drop_page(self, tid, page, frame):
+        # Drop one mapping from one table; the frame stays allocated
+        page_table = self.tables[tid]
+        node_id = self._private_node(tid, page)
+        del page_table[page]
+        self._unmap(frame, node_id)
+        if self.node_sharing and page_table.node(page) is None:
+            # The table released the emptied second-level array
+            self._remove_node(self.nodes[node_id], tid)
+        if self.allocator is not None:
+            self.table_frames[tid] -= 1
+        if self.tlb is not None:
+            for pid in self.table_pids[tid]:
+                self.tlb.invalidate(pid, page)
+
+    def _unmap_page(self, tid, page, frame):
+        # Drop one mapping, freeing the frame if nothing else maps it
+        self._drop_page(tid, page, frame)
+        if self.frame_refs[frame] == 0:
+            self.frame_owner[frame] = FREE
+            self.ref_bits[frame] = 0
+            self.free_frames.append(frame)
+
+    def _map_page(self, page_table, page, frame):
+        tid = self.table_ids[id(page_table)]
+        node_id = self._private_node(tid, page)
+        self.frame_page[frame] = page
+        page_table[page] = frame
+        if node_id is None:
+            # The table made a new second-level array, mapping the frame
+            self._add_node(self._node(page_table, page), tid)
+        else:
+            self._map(frame, node_id)
+
+        if self.allocator is not None:
+            self.table_frames[tid] += 1
+            ring = self.local_rings[tid]
+            ring.append((frame, page))
+            if len(ring) > 2 * self.table_frames[tid] + 64:
+                # Mostly stale entries: rebuild from the table itself
+                self.local_rings[tid] = deque(
+                    (f, p) for p, f in page_table.items())
+
+    def _shared(self, process, page, frame):
+        tid = self.table_ids.get(id(process.pcb.page_table))
+        if tid is None or self.frame_refs[frame] > 1 or len(self.table_pids[tid]) > 1:
+            return True
+        # Only this node maps the frame, but other tables may hold the node
+        node = self._node(process.pcb.page_table, page)
+        return len(self.node_tables[self.node_ids[id(node)]]) > 1
+
+    def _private_table(self, process):
+        # The process's page table, registered and not shared with anyone
+        pid = process.pcb.pid
+        page_table = process.pcb.page_table
+        if self.process_tables.get(pid) is not page_table:
+            page_table = self._adopt(process)
+
+        tid = self.table_ids[id(page_table)]
+        if len(self.table_pids[tid]) > 1:
+            self.table_pids[tid].discard(pid)
+            # A two-level table keeps sharing its second-level arrays, so
+            # this is O(arrays); the other formats are copied whole
+            copy = page_table.share() if self.node_sharing else page_table.copy()
+            page_table = process.pcb.page_table = copy
+            self._register(pid, page_table, source=tid)
+        return page_table
+
+    def _copy_on_write(self, process, page, frame):
+        page_table = self._private_table(process)
+        tid = self.table_ids[id(page_table)]
+        self._private_node(tid, page)
+        if self.frame_refs[frame] == 1:
+            return frame    # every other sharer is gone
+
+        self.cow_faults += 1
+        if self.metrics is not None:
+            self.metrics.record_cow_fault()
+
+        # Unmap first, so the eviction below may take the old frame from
+        # the other sharers but never from this process
+        self._drop_page(tid, page, frame)
+        new_frame = self._allocate_frame(process)
+        self._map_page(page_table, page, new_frame)
+
+        if self.tlb is not None:
+            self.tlb.invalidate(process.pcb.pid, page)
+            self.tlb.insert(process.pcb.pid, page, new_frame)
+        return new_frame
+
+    def _adopt(self, process):
+        # Register the process as a frame owner, converting its page table
+        # to the configured format first if needed
+        pid = process.pcb.pid
+        if pid in self.process_tables:
+            # Its page table was replaced from outside
+            self._detach(pid)
+        page_table = process.pcb.page_table
+        if id(page_table) not in self.table_ids and not isinstance(page_table, self.page_table_type):
+            converted = new_page_table(self.page_table_format)
+            converted.update(page_table)
+            page_table = process.pcb.page_table = converted
+        self._register(pid, page_table)
+        return page_table
+
+    def _record(self, fault, tlb_hit, count=1):
+        if self.metrics is None:
+            return
+        self.metrics.record_page_access(fault, count)
+        if self.tlb is not None:
+            self.metrics.record_tlb_access(tlb_hit, count)
+
+    def access(self, process, logical_address, page_size, write=False):
         page = logical_address // page_size
         offset = logical_address % page_size
+        frame, fault = self._translate(process, page, write)
+        return frame * page_size + offset, fault
+
+    def access_many(self, process, addresses, page_size, write=False):
+        """
+        Translate a whole trace of logical addresses for one process
+
+        Args:
+            process: Process issuing the accesses
+            addresses: Sequence or NumPy array of logical addresses
+            page_size: Page size in bytes
+            write: Whether the accesses are writes
+
+        Returns:
+            tuple: (physical addresses, fault mask) as NumPy arrays, the
+            same values access() would give one address at a time
+        """
+        import numpy as np
+
+        addresses = np.asarray(addresses, dtype=np.int64)
+        pages, offsets = np.divmod(addresses, page_size)
+        faults = np.zeros(len(pages), dtype=bool)
+        if len(pages) == 0:
+            return addresses.copy(), faults
+
+        # Only the first access of a run on the same page can fault; the
+        # rest are hits on a frame whose reference bit is already set (and,
+        # for writes, that the first access already made private). An
+        # allocator has to see every reference, so then nothing is batched.
+        if self.allocator is None:
+            starts = np.flatnonzero(np.concatenate(([True], pages[1:] != pages[:-1])))
+        else:
+            starts = np.arange(len(pages))
+        runs = [self._translate(process, page, write) for page in pages[starts].tolist()]
+        run_frames = np.fromiter((frame for frame, _ in runs), np.int64, len(runs))
+        faults[starts] = np.fromiter((fault for _, fault in runs), bool, len(runs))
+
+        # The repeats are hits, in the TLB too: their entry is already the
+        # most recently used one of its set
+        repeats = len(pages) - len(starts)
+        if repeats:
+            if self.tlb is not None:
+                self.tlb.hits += repeats
+            self._record(fault=False, tlb_hit=True, count=repeats)
+
+        lengths = np.diff(np.append(starts, len(pages)))
+        frames = np.repeat(run_frames, lengths)
+        return frames * page_size + offsets, faults
 
-        # Page hit
-        if page in process.pcb.page_table:
-            frame = process.pcb.page_table[page]
-            self.ref_bits[frame] = 1
-            return frame * page_size + offset, False
-
-        # Page fault
-        self.page_faults += 1
-
-        # Try empty frame first
-        for i in range(self.total_frames):
-            if self.frames[i] is None:
-                self.frames[i] = (process.pcb.pid, page)
-                self.ref_bits[i] = 1
-                process.pcb.page_table[page] = i
-                return i * page_size + offset, True
-
-        # Replace using clock algorithm
-        frame = self._replace_page(process, page)
-        process.pcb.page_table[page] = frame
-        return frame * page_size + offset, True
+    def access_chunks(self, process, chunks, page_size, write=False):
+        """
+        access_many() over an iterable of address arrays, such as the
+        readers in memory/trace.py, yielding (physical addresses, fault
+        mask) per chunk so memory use stays flat
+        """
+        for chunk in chunks:
+            yield self.access_many(process, chunk, page_size, write)
@@ -4,6 +4,15 @@ Stores process state and information
 """
 
 class PCB:
+    # Fixed attribute set: no per-instance __dict__, and the children list
+    # and page table are only allocated once something needs them
+    __slots__ = (
+        "pid", "arrival_time", "burst_time", "remaining_time",
+        "priority", "queue_level", "wait_time", "first_run_time",
+        "completion_time", "state",
+        "parent", "_children", "_page_table",
+    )
+
     def __init__(self, pid, arrival_time, burst_time, priority=5):
         self.pid = pid
         self.arrival_time = arrival_time
@@ -13,10 +22,31 @@ class PCB:
         self.priority = priority
         self.queue_level = 0
         self.wait_time = 0
+        self.first_run_time = None
         self.completion_time = None
         self.state = "NEW"
 
         self.parent = None
-        self.children = []
-        self.page_table = {}
+        self._children = None
+        self._page_table = None
+
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._children = value
+
+    @property
+    def page_table(self):
+        if self._page_table is None:
+            self._page_table = {}
+        return self._page_table
+
+    @page_table.setter
+    def page_table(self, value):
+        self._page_table = value
 
@@ -5,12 +5,21 @@ Handles process management and operations
 from thread.thread import Thread
 
 class Process:
+    __slots__ = ("pcb", "_threads", "next_tid")
+
     def __init__(self, pid, arrival, burst, priority=5):
         from process.pcb import PCB
         self.pcb = PCB(pid, arrival, burst, priority)
-        self.threads = []
+        self._threads = None
         self.next_tid = 0
 
+    @property
+    def threads(self):
+        # Most processes never spawn a thread, so the list is created lazily
+        if self._threads is None:
+            self._threads = []
+        return self._threads
+
     def create_thread(self):
         t = Thread(self.next_tid, self)
         self.next_tid += 1
@@ -0,0 +1,138 @@
+"""
+Process Table
+Columnar (structure-of-arrays) storage for large workloads
+"""
+
+import numpy as np
+
+# PCB fields stored as one int64 column each
+COLUMNS = (
+    "pid", "arrival_time", "burst_time", "remaining_time",
+    "priority", "queue_level", "wait_time", "first_run_time", "completion_time",
+)
+
+# Stands in for None (not dispatched / not completed yet) in integer columns
+UNSET = -1
+
+
+class ProcessView:
+    """
+    Lightweight handle on one row of a ProcessTable. It stands in for both
+    the Process and its PCB, so existing code can keep using p.pcb.field.
+    """
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def pcb(self):
+        return self
+
+    def __eq__(self, other):
+        return (isinstance(other, ProcessView)
+                and self.table is other.table and self.index == other.index)
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+
+    def __repr__(self):
+        return f"ProcessView(pid={self.pid}, index={self.index})"
+
+
+def _column(name):
+    def get(self):
+        return getattr(self.table, name).item(self.index)
+
+    def set(self, value):
+        getattr(self.table, name)[self.index] = value
+
+    return property(get, set)
+
+
+def _optional_column(name):
+    def get(self):
+        value = getattr(self.table, name).item(self.index)
+        return None if value == UNSET else value
+
+    def set(self, value):
+        getattr(self.table, name)[self.index] = UNSET if value is None else value
+
+    return property(get, set)
+
+
+for _name in COLUMNS:
+    if _name in ("first_run_time", "completion_time"):
+        setattr(ProcessView, _name, _optional_column(_name))
+    else:
+        setattr(ProcessView, _name, _column(_name))
+
+
+class ProcessTable:
+    def __init__(self, size):
+        for name in COLUMNS:
+            setattr(self, name, np.zeros(size, dtype=np.int64))
+        self.priority[:] = 5
+        # Priorities as loaded; schedulers with aging rewrite `priority`
+        self.base_priority = np.full(size, 5, dtype=np.int64)
+        self.first_run_time[:] = UNSET
+        self.completion_time[:] = UNSET
+
+    @classmethod
+    def from_arrays(cls, pid, arrival_time, burst_time, priority=None):
+        table = cls(len(pid))
+        table.pid[:] = pid
+        table.arrival_time[:] = arrival_time
+        table.burst_time[:] = burst_time
+        table.remaining_time[:] = burst_time
+        if priority is not None:
+            table.priority[:] = priority
+            table.base_priority[:] = priority
+        return table
+
+    @classmethod
+    def from_processes(cls, processes):
+        table = cls(len(processes))
+        for name in COLUMNS:
+            column = getattr(table, name)
+            for i, p in enumerate(processes):
+                value = getattr(p.pcb, name)
+                column[i] = UNSET if value is None else value
+        table.base_priority[:] = table.priority
+        return table
+
+    def reset(self):
+        """Restore every process to its unscheduled state"""
+        self.remaining_time[:] = self.burst_time
+        self.priority[:] = self.base_priority
+        self.queue_level[:] = 0
+        self.wait_time[:] = 0
+        self.first_run_time[:] = UNSET
+        self.completion_time[:] = UNSET
+
+    def completed(self):
+        """Boolean mask of processes that have finished"""
+        return self.completion_time != UNSET
+
+    def arrival_order(self):
+        """Row indices sorted by arrival time, ties in table order"""
+        return np.argsort(self.arrival_time, kind="stable")
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("process table index out of range")
+        return ProcessView(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield ProcessView(self, i)
+
+    def views(self):
+        """ProcessView for every row, for APIs that take a process list"""
+        return list(self)
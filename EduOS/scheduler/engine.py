@@ -0,0 +1,133 @@
+"""
+Scheduling Engine
+Shared discrete-event simulation core for all scheduling policies
+"""
+
+class SchedulingPolicy:
+    """
+    A policy only manages its ready set. The engine owns the clock,
+    arrivals, idle skipping and Gantt/stat recording, and calls back into
+    the policy at every decision point.
+    """
+
+    # Re-pick at every arrival instead of letting the current slice finish
+    preemptive = False
+
+    def on_arrival(self, process, time):
+        """Add a newly arrived process to the ready set"""
+        raise NotImplementedError
+
+    def pick_next(self, time):
+        """Remove and return the process to dispatch, or None if idle"""
+        raise NotImplementedError
+
+    def on_preempt(self, process, time):
+        """Return a process whose slice ended unfinished to the ready set"""
+        self.on_arrival(process, time)
+
+    def on_complete(self, process, time):
+        """Called once a process has finished"""
+
+    def time_slice(self, process, time, next_arrival):
+        """Longest run for a dispatched process, None to run until done"""
+        return None
+
+    def next_event(self, time):
+        """Next time the policy needs a decision point of its own, if any"""
+        return None
+
+
+def simulate(processes, policy, merge=True, gantt=None):
+    """
+    Run processes to completion under the given policy
+
+    Args:
+        processes: List of Process objects
+        policy: SchedulingPolicy instance
+        merge: Extend the previous Gantt entry when the same process is
+            dispatched again without a gap
+        gantt: Optional container to record into (e.g. a GanttChart)
+
+    Returns:
+        tuple: (gantt, stats) with (pid, start, end) entries and one
+        (pid, waiting, turnaround) entry per process in completion order
+    """
+    time = 0
+    completed = 0
+    n = len(processes)
+    gantt = [] if gantt is None else gantt
+    stats = []
+
+    processes = sorted(processes, key=lambda p: p.pcb.arrival_time)
+    i = 0
+    current = None
+    last = None
+
+    while completed < n:
+        while i < n and processes[i].pcb.arrival_time <= time:
+            policy.on_arrival(processes[i], time)
+            i += 1
+
+        if current is not None:
+            policy.on_preempt(current, time)
+
+        current = policy.pick_next(time)
+        if current is None:
+            # CPU idle: skip to the next arrival
+            time = processes[i].pcb.arrival_time
+            continue
+
+        # Run until the process finishes, its slice ends or, for preemptive
+        # policies, the next arrival or policy event
+        pcb = current.pcb
+        next_arrival = processes[i].pcb.arrival_time if i < n else None
+        run = pcb.remaining_time
+        limit = policy.time_slice(current, time, next_arrival)
+        if limit is not None:
+            run = min(run, limit)
+        if policy.preemptive and next_arrival is not None:
+            run = min(run, next_arrival - time)
+        event = policy.next_event(time)
+        if event is not None:
+            run = min(run, event - time)
+
+        start = time
+        if pcb.first_run_time is None:
+            pcb.first_run_time = start
+        time += run
+        pcb.remaining_time -= run
+
+        if merge and current is last and gantt[-1][2] == start:
+            gantt[-1] = (pcb.pid, gantt[-1][1], time)
+        else:
+            gantt.append((pcb.pid, start, time))
+        last = current
+
+        if pcb.remaining_time == 0:
+            pcb.completion_time = time
+            turnaround = time - pcb.arrival_time
+            stats.append((pcb.pid, turnaround - pcb.burst_time, turnaround))
+            policy.on_complete(current, time)
+            completed += 1
+            current = None
+
+    return gantt, stats
+
+
+def absorb_idle(gantt):
+    """
+    Gantt chart in the format of the tick-based schedulers: a new entry
+    only when the pid changes, each one lasting until the next starts
+    """
+    starts = []
+    for pid, start, _ in gantt:
+        if not starts or starts[-1][0] != pid:
+            starts.append((pid, start))
+
+    final_gantt = []
+    for i in range(len(starts)):
+        pid, start = starts[i]
+        end = starts[i + 1][1] if i + 1 < len(starts) else gantt[-1][2]
+        final_gantt.append((pid, start, end))
+
+    return final_gantt
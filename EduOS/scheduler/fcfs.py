@@ -2,23 +2,19 @@
 First Come First Served (FCFS) Scheduler
 """
 
-def fcfs(processes):
-    time = 0
-    gantt = []
-    stats = []
+from collections import deque
+from scheduler.engine import SchedulingPolicy, simulate
 
-    for p in sorted(processes, key=lambda x: x.pcb.arrival_time):
-        if time < p.pcb.arrival_time:
-            time = p.pcb.arrival_time
+class FCFSPolicy(SchedulingPolicy):
+    def __init__(self):
+        self.queue = deque()
 
-        start = time
-        time += p.pcb.burst_time
-        end = time
+    def on_arrival(self, process, time):
+        self.queue.append(process)
 
-        waiting = start - p.pcb.arrival_time
-        turnaround = end - p.pcb.arrival_time
+    def pick_next(self, time):
+        return self.queue.popleft() if self.queue else None
 
-        gantt.append((p.pcb.pid, start, end))
-        stats.append((p.pcb.pid, waiting, turnaround))
 
-    return gantt, stats
+def fcfs(processes):
+    return simulate(processes, FCFSPolicy(), merge=False)
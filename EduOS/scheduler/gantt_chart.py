@@ -0,0 +1,35 @@
+"""
+Compact Gantt Chart
+Stores (pid, start, end) slices column-wise in typed arrays
+"""
+
+from array import array
+
+class GanttChart:
+    def __init__(self):
+        # Integer pids and times, one array per column instead of a tuple
+        # object per slice
+        self.pids = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def append(self, entry):
+        pid, start, end = entry
+        self.pids.append(pid)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.pids)
+
+    def __getitem__(self, index):
+        return self.pids[index], self.starts[index], self.ends[index]
+
+    def __setitem__(self, index, entry):
+        self.pids[index], self.starts[index], self.ends[index] = entry
+
+    def __iter__(self):
+        return zip(self.pids, self.starts, self.ends)
+
+    def __repr__(self):
+        return f"GanttChart({list(self)})"
@@ -1,89 +1,53 @@
 from collections import deque
+from scheduler.engine import SchedulingPolicy, simulate, absorb_idle
 
 Q0_QUANTUM = 2
 Q1_QUANTUM = 4
 AGING_LIMIT = 6
 
-def mlfq(processes):
-    time = 0
-    completed = 0
-    n = len(processes)
-
-    processes = sorted(processes, key=lambda p: p.pcb.arrival_time)
-
-    q0 = deque()
-    q1 = deque()
-    q2 = deque()
-
-    gantt = []
-    last_pid = None
-
-    while completed < n:
+class MLFQPolicy(SchedulingPolicy):
+    # One round-robin level per quantum, plus a last level that runs each
+    # process to completion. A process that has waited aging_limit time
+    # units in a lower level is promoted back to level 0 (None disables
+    # aging).
+    def __init__(self, quanta=(Q0_QUANTUM, Q1_QUANTUM), aging_limit=AGING_LIMIT):
+        self.quanta = quanta
+        self.aging_limit = aging_limit
+        self.last_level = len(quanta)
+        # Entries are (enqueue_time, process); each queue is in enqueue
+        # order, so the longest waiter is always at the head
+        self.queues = [deque() for _ in range(len(quanta) + 1)]
+
+    def on_arrival(self, process, time):
         # Add arriving processes to highest queue
-        for p in processes:
-            if p.pcb.arrival_time == time:
-                p.pcb.queue_level = 0
-                q0.append(p)
-
-        # Aging: promote waiting processes
-        for q in [q1, q2]:
-            for p in list(q):
-                p.pcb.wait_time += 1
-                if p.pcb.wait_time >= AGING_LIMIT:
-                    q.remove(p)
+        process.pcb.queue_level = 0
+        self.queues[0].append((process.pcb.arrival_time, process))
+
+    def on_preempt(self, process, time):
+        # Demote process
+        process.pcb.queue_level = min(process.pcb.queue_level + 1, self.last_level)
+        self.queues[process.pcb.queue_level].append((time, process))
+
+    def pick_next(self, time):
+        # Aging: promote processes that have waited too long
+        if self.aging_limit is not None:
+            for q in self.queues[1:]:
+                while q and time - q[0][0] >= self.aging_limit:
+                    _, p = q.popleft()
                     p.pcb.queue_level = 0
-                    p.pcb.wait_time = 0
-                    q0.append(p)
-
-        # Select queue
-        if q0:
-            current = q0.popleft()
-            quantum = Q0_QUANTUM
-        elif q1:
-            current = q1.popleft()
-            quantum = Q1_QUANTUM
-        elif q2:
-            current = q2.popleft()
-            quantum = current.pcb.remaining_time
-        else:
-            time += 1
-            continue
-
-        # Gantt tracking
-        if last_pid != current.pcb.pid:
-            gantt.append((current.pcb.pid, time))
-            last_pid = current.pcb.pid
-
-        # Execute
-        exec_time = min(quantum, current.pcb.remaining_time)
-        current.pcb.remaining_time -= exec_time
-        time += exec_time
+                    self.queues[0].append((time, p))
 
-        # Add new arrivals during execution
-        for p in processes:
-            if p.pcb.arrival_time > time - exec_time and p.pcb.arrival_time <= time:
-                q0.append(p)
+        for q in self.queues:
+            if q:
+                return q.popleft()[1]
+        return None
 
-        # Process finished
-        if current.pcb.remaining_time == 0:
-            current.pcb.completion_time = time
-            completed += 1
-        else:
-            # Demote process
-            if current.pcb.queue_level == 0:
-                current.pcb.queue_level = 1
-                q1.append(current)
-            elif current.pcb.queue_level == 1:
-                current.pcb.queue_level = 2
-                q2.append(current)
-            else:
-                q2.append(current)
+    def time_slice(self, process, time, next_arrival):
+        if process.pcb.queue_level < self.last_level:
+            return self.quanta[process.pcb.queue_level]
+        return None
 
-    # Close Gantt chart
-    final_gantt = []
-    for i in range(len(gantt)):
-        pid, start = gantt[i]
-        end = gantt[i + 1][1] if i + 1 < len(gantt) else time
-        final_gantt.append((pid, start, end))
 
-    return final_gantt
+def mlfq(processes, quanta=(Q0_QUANTUM, Q1_QUANTUM), aging_limit=AGING_LIMIT):
+    gantt, _ = simulate(processes, MLFQPolicy(quanta, aging_limit))
+    return absorb_idle(gantt)
@@ -1,53 +1,134 @@
+import heapq
+from scheduler.engine import SchedulingPolicy, simulate, absorb_idle
+
 AGING_INTERVAL = 3
 MIN_PRIORITY = 0
 
+
+def _aged_priority(priority, wait_time, waited):
+    # Closed form of applying the per-tick aging rule `waited` times,
+    # starting from the given priority and wait_time
+    steps = (wait_time + waited) // AGING_INTERVAL - wait_time // AGING_INTERVAL
+    if steps == 0:
+        return priority
+    return max(MIN_PRIORITY, priority - steps)
+
+
+class PreemptivePriorityPolicy(SchedulingPolicy):
+    # Every ready process ages by one unit per tick, so priorities are
+    # computed analytically and the engine only has to stop at the ticks
+    # where some waiting process's priority actually changes
+    preemptive = True
+
+    def __init__(self):
+        self.ready = []         # heap of (priority, remaining_time, seq, process)
+        self.entries = {}       # process -> live heap entry, anything else is stale
+        self.aging = []         # heap of (tick, id, process) priority changes
+        self.next_aging = {}
+        self.initial = {}
+        self.seq = 0
+        self.raised_seq = 0
+        self.arrived = []
+        self.returning = None
+        self.running = None
+
+    def priority_at(self, process, t):
+        priority, wait_time = self.initial[process]
+        return _aged_priority(priority, wait_time, t - process.pcb.arrival_time + 1)
+
+    def on_arrival(self, process, time):
+        self.initial[process] = (process.pcb.priority, process.pcb.wait_time)
+        self.arrived.append(process)
+
+    def on_preempt(self, process, time):
+        self.returning = process
+
+    def on_complete(self, process, time):
+        pcb = process.pcb
+        pcb.wait_time = self.initial[process][1] + time - pcb.arrival_time
+        pcb.priority = self.priority_at(process, time - 1)
+        del self.initial[process]
+        self.next_aging.pop(process, None)
+
+    def _schedule_aging(self, process, t):
+        if self.priority_at(process, t) == MIN_PRIORITY or self.next_aging.get(process, -1) > t:
+            return
+        # First tick after t where wait_time reaches a multiple of the interval
+        offset = process.pcb.arrival_time - self.initial[process][1] - t - 2
+        self.next_aging[process] = t + 1 + offset % AGING_INTERVAL
+        heapq.heappush(self.aging, (self.next_aging[process], id(process), process))
+
+    def _push(self, process, priority, order):
+        process.pcb.priority = priority
+        self.entries[process] = (priority, process.pcb.remaining_time, order, process)
+        heapq.heappush(self.ready, self.entries[process])
+
+    def pick_next(self, time):
+        # Sort keys that changed since the previous decision: the process
+        # that just ran, then everyone whose priority aged at this tick, in
+        # the order a stable per-tick sort would have them
+        aged = []
+        while self.aging and self.aging[0][0] <= time:
+            tick, _, p = heapq.heappop(self.aging)
+            if self.next_aging.get(p) == tick and p in self.entries:
+                aged.append(p)
+        aged.sort(key=lambda p: self.entries[p][:3])
+        changed = ([self.returning] if self.returning is not None else []) + aged
+        self.returning = None
+
+        lowered = []
+        raised = []
+        for p in changed:
+            priority = self.priority_at(p, time)
+            if priority > self.priority_at(p, time - 1):
+                raised.append((p, priority))
+            else:
+                lowered.append((p, priority))
+
+        for p, priority in lowered:
+            self._push(p, priority, self.seq)
+            self.seq += 1
+        # A key that went up was ahead of every process it now ties with
+        for p, priority in reversed(raised):
+            self.raised_seq -= 1
+            self._push(p, priority, self.raised_seq)
+        for p in changed:
+            self._schedule_aging(p, time)
+
+        # Arrivals go behind everything already waiting
+        for p in self.arrived:
+            self._push(p, self.priority_at(p, time), self.seq)
+            self.seq += 1
+            self._schedule_aging(p, time)
+        self.arrived = []
+
+        while self.ready and self.entries.get(self.ready[0][3]) is not self.ready[0]:
+            heapq.heappop(self.ready)
+        if not self.ready:
+            self.running = None
+            return None
+
+        # Highest priority first
+        self.running = heapq.heappop(self.ready)[3]
+        del self.entries[self.running]
+        return self.running
+
+    def next_event(self, time):
+        while self.aging:
+            tick, _, p = self.aging[0]
+            if self.next_aging.get(p) == tick and (
+                    p in self.entries
+                    or p is self.running and p.pcb.priority < MIN_PRIORITY):
+                return tick
+            # Stale, or the running process: aging only lowers its priority
+            # value, which cannot get it preempted, and is rescheduled when
+            # it goes back to the ready heap
+            heapq.heappop(self.aging)
+            if self.next_aging.get(p) == tick:
+                del self.next_aging[p]
+        return None
+
+
 def preemptive_priority(processes):
-    time = 0
-    completed = 0
-    n = len(processes)
-
-    processes = sorted(processes, key=lambda p: p.pcb.arrival_time)
-    ready = []
-    gantt = []
-    last_pid = None
-
-    while completed < n:
-        # Add arriving processes
-        for p in processes:
-            if p.pcb.arrival_time == time:
-                ready.append(p)
-
-        # Apply aging to waiting processes
-        for p in ready:
-            p.pcb.wait_time += 1
-            if p.pcb.wait_time % AGING_INTERVAL == 0:
-                p.pcb.priority = max(MIN_PRIORITY, p.pcb.priority - 1)
-
-        if ready:
-            # Highest priority first
-            ready.sort(key=lambda p: (p.pcb.priority, p.pcb.remaining_time))
-            current = ready[0]
-
-            # Gantt tracking
-            if last_pid != current.pcb.pid:
-                gantt.append((current.pcb.pid, time))
-                last_pid = current.pcb.pid
-
-            # Execute for 1 unit
-            current.pcb.remaining_time -= 1
-
-            if current.pcb.remaining_time == 0:
-                current.pcb.completion_time = time + 1
-                ready.remove(current)
-                completed += 1
-
-        time += 1
-
-    # Close Gantt chart
-    final_gantt = []
-    for i in range(len(gantt)):
-        pid, start = gantt[i]
-        end = gantt[i + 1][1] if i + 1 < len(gantt) else time
-        final_gantt.append((pid, start, end))
-
-    return final_gantt
+    gantt, _ = simulate(processes, PreemptivePriorityPolicy())
+    return absorb_idle(gantt)
@@ -2,32 +2,22 @@
 Priority Scheduler
 """
 
-def priority_scheduling(processes):
-    time = 0
-    ready = []
-    gantt = []
-    stats = []
-
-    processes = sorted(processes, key=lambda x: x.pcb.arrival_time)
+import heapq
+from scheduler.engine import SchedulingPolicy, simulate
 
-    while processes or ready:
-        while processes and processes[0].pcb.arrival_time <= time:
-            ready.append(processes.pop(0))
+class PriorityPolicy(SchedulingPolicy):
+    def __init__(self):
+        self.ready = []     # heap of (priority, arrival order, process)
+        self.seq = 0
 
-        if ready:
-            ready.sort(key=lambda x: x.pcb.priority)
-            p = ready.pop(0)
+    def on_arrival(self, process, time):
+        heapq.heappush(self.ready, (process.pcb.priority, self.seq, process))
+        self.seq += 1
 
-            start = time
-            time += p.pcb.burst_time
-            end = time
+    def pick_next(self, time):
+        # Equal priorities go to the earlier arrival
+        return heapq.heappop(self.ready)[2] if self.ready else None
 
-            waiting = start - p.pcb.arrival_time
-            turnaround = end - p.pcb.arrival_time
 
-            gantt.append((p.pcb.pid, start, end))
-            stats.append((p.pcb.pid, waiting, turnaround))
-        else:
-            time += 1
-
-    return gantt, stats
+def priority_scheduling(processes):
+    return simulate(processes, PriorityPolicy(), merge=False)
@@ -3,40 +3,45 @@ Round Robin Scheduler
 """
 
 from collections import deque
-
-def round_robin(processes, quantum):
-    time = 0
-    queue = deque()
-    gantt = []
-    stats = {}
-    processes = sorted(processes, key=lambda x: x.pcb.arrival_time)
-
-    while processes or queue:
-        while processes and processes[0].pcb.arrival_time <= time:
-            queue.append(processes.pop(0))
-
-        if queue:
-            p = queue.popleft()
-            exec_time = min(quantum, p.pcb.remaining_time)
-
-            start = time
-            time += exec_time
-            p.pcb.remaining_time -= exec_time
-            end = time
-
-            gantt.append((p.pcb.pid, start, end))
-
-            while processes and processes[0].pcb.arrival_time <= time:
-                queue.append(processes.pop(0))
-
-            if p.pcb.remaining_time > 0:
-                queue.append(p)
-            else:
-                turnaround = end - p.pcb.arrival_time
-                waiting = turnaround - p.pcb.burst_time
-                stats[p.pcb.pid] = (waiting, turnaround)
-        else:
-            time += 1
-
-    return gantt, stats
+from scheduler.engine import SchedulingPolicy, simulate
+from scheduler.gantt_chart import GanttChart
+
+class RoundRobinPolicy(SchedulingPolicy):
+    def __init__(self, quantum, merge=False):
+        self.quantum = quantum
+        self.merge = merge
+        self.queue = deque()
+
+    def on_arrival(self, process, time):
+        self.queue.append(process)
+
+    def pick_next(self, time):
+        return self.queue.popleft() if self.queue else None
+
+    def time_slice(self, process, time, next_arrival):
+        if self.merge and not self.queue:
+            # Alone on the CPU, it keeps running whole quanta up to the
+            # slice in which the next process arrives
+            if next_arrival is None:
+                return None
+            return max(1, -(-(next_arrival - time) // self.quantum)) * self.quantum
+        return self.quantum
+
+
+def round_robin(processes, quantum, merge=False, compact=False):
+    """
+    Args:
+        processes: List of Process objects
+        quantum: Time slice length
+        merge: Coalesce back-to-back slices of the same process into one
+            Gantt entry
+        compact: Return the Gantt chart as an array-backed GanttChart
+            instead of a list of tuples
+
+    Returns:
+        tuple: (gantt, stats) where stats maps pid -> (waiting, turnaround)
+    """
+    gantt, stats = simulate(processes, RoundRobinPolicy(quantum, merge),
+                            merge=merge, gantt=GanttChart() if compact else None)
+    return gantt, {pid: (waiting, turnaround) for pid, waiting, turnaround in stats}
 
@@ -1,22 +1,69 @@
+from sync.wait_queue import new_wait_queue
+
+
 class Mutex:
-    def __init__(self):
+    def __init__(self, detector=None, queue="fifo", protocol=None, ceiling=None):
+        """
+        Args:
+            detector: Optional deadlock.detection.DeadlockDetector fed
+                every wait, acquisition and release
+            queue: Wait queue order, "fifo" or "priority" (PCB priority)
+            protocol: Optional sync.priority.PriorityInheritance or
+                PriorityCeiling, shared by the mutexes it governs
+            ceiling: Best priority of any thread that locks this mutex,
+                for PriorityCeiling
+        """
         self.locked = False
         self.owner = None
-        self.wait_queue = []
+        self.wait_queue = new_wait_queue(queue)
+        self.detector = detector
+        self.protocol = protocol
+        self.ceiling = ceiling
 
     def acquire(self, thread):
         if not self.locked:
             self.locked = True
             self.owner = thread
+            if self.protocol is not None:
+                self.protocol.on_acquire(thread, self)
+            if self.detector is not None:
+                self.detector.acquired(thread, self)
         else:
             thread.state = "WAITING"
             self.wait_queue.append(thread)
+            if self.protocol is not None:
+                self.protocol.on_block(thread, self)
+            if self.detector is not None:
+                self.detector.wait(thread, self)
 
     def release(self):
+        owner = self.owner
+        if self.detector is not None:
+            self.detector.released(owner, self)
         if self.wait_queue:
-            next_thread = self.wait_queue.pop(0)
+            next_thread = self.wait_queue.popleft()
             next_thread.state = "READY"
             self.owner = next_thread
         else:
+            next_thread = None
             self.locked = False
             self.owner = None
+
+        if self.protocol is not None:
+            if owner is not None:
+                self.protocol.on_release(owner, self)
+            if next_thread is not None:
+                self.protocol.on_acquire(next_thread, self)
+        if next_thread is not None and self.detector is not None:
+            self.detector.acquired(next_thread, self)
+
+    def cancel(self, thread):
+        """Withdraw a waiting thread's request"""
+        self.wait_queue.remove(thread)
+        if self.protocol is not None:
+            self.protocol.on_cancel(thread, self)
+
+    def revoke(self, thread):
+        """Take the mutex back from its owner"""
+        if self.owner is thread:
+            self.release()
@@ -0,0 +1,99 @@
+"""
+Priority Protocols
+Priority inheritance and priority ceiling for Mutex owners
+"""
+
+
+class PriorityProtocol:
+    """
+    Bookkeeping shared by every mutex using the protocol. A process's PCB
+    priority is raised (made numerically lower) to the best priority any
+    mutex it owns lends it, and falls back to its own once it releases
+    them. Subclasses decide what a mutex lends.
+    """
+
+    def __init__(self):
+        self.base = {}          # process -> priority before any boost
+        self.held = {}          # process -> mutexes its threads own
+        self.blocked_on = {}    # thread -> mutex it waits for
+        self.blocked = {}       # process -> its threads in blocked_on
+        self.boosts = 0
+
+    def lend(self, mutex):
+        """Priority the mutex lends its owner, or None"""
+        return None
+
+    def _refresh(self, process):
+        # Returns True if the process's priority changed
+        pcb = process.pcb
+        priority = self.base.get(process, pcb.priority)
+        for mutex in self.held.get(process, ()):
+            lent = self.lend(mutex)
+            if lent is not None and lent < priority:
+                priority = lent
+        if priority == pcb.priority:
+            return False
+
+        if process not in self.base:
+            self.base[process] = pcb.priority
+            self.boosts += 1
+        elif priority == self.base[process]:
+            del self.base[process]
+        pcb.priority = priority
+        for thread in self.blocked.get(process, ()):
+            self.blocked_on[thread].wait_queue.update(thread)
+        return True
+
+    def _propagate(self, mutex):
+        # A mutex's waiters changed: refresh its owner, and the owners of
+        # whatever that owner is blocked on in turn
+        seen = set()
+        while mutex is not None and mutex.owner is not None and mutex not in seen:
+            seen.add(mutex)
+            owner = mutex.owner
+            if not self._refresh(owner.process):
+                return
+            mutex = self.blocked_on.get(owner)
+
+    def _unblock(self, thread):
+        if self.blocked_on.pop(thread, None) is not None:
+            threads = self.blocked[thread.process]
+            threads.discard(thread)
+            if not threads:
+                del self.blocked[thread.process]
+
+    def on_block(self, thread, mutex):
+        self.blocked_on[thread] = mutex
+        self.blocked.setdefault(thread.process, set()).add(thread)
+        self._propagate(mutex)
+
+    def on_cancel(self, thread, mutex):
+        self._unblock(thread)
+        self._propagate(mutex)
+
+    def on_acquire(self, thread, mutex):
+        self._unblock(thread)
+        self.held.setdefault(thread.process, []).append(mutex)
+        self._refresh(thread.process)
+
+    def on_release(self, thread, mutex):
+        held = self.held[thread.process]
+        held.remove(mutex)
+        if not held:
+            del self.held[thread.process]
+        self._refresh(thread.process)
+
+
+class PriorityInheritance(PriorityProtocol):
+    # The owner runs at the priority of its most urgent waiter, passed
+    # along chains of blocked owners
+    def lend(self, mutex):
+        return mutex.wait_queue.highest_priority()
+
+
+class PriorityCeiling(PriorityProtocol):
+    # Immediate ceiling: the owner runs at the mutex's ceiling, the best
+    # priority of any thread that will lock it, from the moment it locks
+    # it, so nobody who shares the mutex can preempt it
+    def lend(self, mutex):
+        return mutex.ceiling
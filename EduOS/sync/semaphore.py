@@ -1,16 +1,45 @@
+from sync.wait_queue import new_wait_queue
+
+
 class Semaphore:
-    def __init__(self, value):
+    def __init__(self, value, detector=None, queue="fifo"):
+        """
+        Args:
+            value: Initial count
+            detector: Optional deadlock.detection.DeadlockDetector; holders
+                are only tracked when the thread that waited also passes
+                itself to signal()
+            queue: Wait queue order, "fifo" or "priority" (PCB priority)
+        """
         self.value = value
-        self.wait_queue = []
+        self.wait_queue = new_wait_queue(queue)
+        self.detector = detector
 
     def wait(self, thread):
         self.value -= 1
         if self.value < 0:
             thread.state = "WAITING"
             self.wait_queue.append(thread)
+            if self.detector is not None:
+                self.detector.wait(thread, self)
+        elif self.detector is not None:
+            self.detector.acquired(thread, self)
 
-    def signal(self):
+    def signal(self, thread=None):
         self.value += 1
+        if self.detector is not None and thread is not None:
+            self.detector.released(thread, self)
         if self.wait_queue:
-            thread = self.wait_queue.pop(0)
-            thread.state = "READY"
+            waiter = self.wait_queue.popleft()
+            waiter.state = "READY"
+            if self.detector is not None:
+                self.detector.acquired(waiter, self)
+
+    def cancel(self, thread):
+        """Withdraw a waiting thread's request"""
+        self.wait_queue.remove(thread)
+        self.value += 1
+
+    def revoke(self, thread):
+        """Give back one unit held by thread"""
+        self.signal(thread)
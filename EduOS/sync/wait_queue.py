@@ -0,0 +1,149 @@
+"""
+Wait Queues
+FIFO and priority-ordered queues of threads blocked on a Mutex/Semaphore
+"""
+
+import heapq
+from collections import deque
+
+
+def thread_priority(thread):
+    # Lower value = higher priority, as in the priority schedulers
+    return thread.process.pcb.priority
+
+
+class FIFOWaitQueue:
+    """
+    Waiters woken in arrival order, O(1) per wakeup. Waiter priorities
+    are only tracked once highest_priority() is first asked for (by a
+    priority protocol): then a count per priority value and a lazy heap
+    of the values keep every operation O(log n).
+    """
+
+    def __init__(self):
+        self.queue = deque()
+        self.keys = None        # thread -> priority it is counted under
+        self.counts = {}        # priority -> waiters with it
+        self.heap = []          # priorities, stale once their count is 0
+
+    def _count(self, thread):
+        priority = thread_priority(thread)
+        self.keys[thread] = priority
+        count = self.counts.get(priority, 0)
+        if not count:
+            # Priorities whose count dropped to 0 linger; keep the heap small
+            if len(self.heap) > 2 * len(self.counts) + 64:
+                self.heap = [p for p, c in self.counts.items() if c]
+                heapq.heapify(self.heap)
+            heapq.heappush(self.heap, priority)
+        self.counts[priority] = count + 1
+
+    def _uncount(self, thread):
+        self.counts[self.keys.pop(thread)] -= 1
+
+    def append(self, thread):
+        self.queue.append(thread)
+        if self.keys is not None:
+            self._count(thread)
+
+    def popleft(self):
+        thread = self.queue.popleft()
+        if self.keys is not None:
+            self._uncount(thread)
+        return thread
+
+    def remove(self, thread):
+        self.queue.remove(thread)
+        if self.keys is not None:
+            self._uncount(thread)
+
+    def update(self, thread):
+        """A waiter's priority changed; only the tracked counts depend on it"""
+        if self.keys is not None and thread in self.keys:
+            self._uncount(thread)
+            self._count(thread)
+
+    def highest_priority(self):
+        if self.keys is None:
+            self.keys = {}
+            for thread in self.queue:
+                self._count(thread)
+        heap = self.heap
+        while heap and not self.counts.get(heap[0]):
+            self.counts.pop(heapq.heappop(heap), None)
+        return heap[0] if heap else None
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+class PriorityWaitQueue:
+    """
+    Waiters woken highest PCB priority first, arrival order among equals.
+    A heap of (priority, seq, thread) with lazy deletion, so removing a
+    waiter or changing its priority is a new entry, not a rebuild.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.entries = {}       # thread -> live heap entry
+        self.seq = 0
+
+    def append(self, thread):
+        entry = (thread_priority(thread), self.seq, thread)
+        self.seq += 1
+        self.entries[thread] = entry
+        heapq.heappush(self.heap, entry)
+
+    def update(self, thread):
+        """Re-key a waiter whose priority changed, keeping its arrival order"""
+        old = self.entries.get(thread)
+        if old is not None and old[0] != thread_priority(thread):
+            entry = (thread_priority(thread), old[1], thread)
+            self.entries[thread] = entry
+            heapq.heappush(self.heap, entry)
+            # Re-keyed waiters leave stale entries behind; keep the heap O(n)
+            if len(self.heap) > 2 * len(self.entries) + 64:
+                self.heap = list(self.entries.values())
+                heapq.heapify(self.heap)
+
+    def remove(self, thread):
+        del self.entries[thread]
+
+    def _clean(self):
+        heap = self.heap
+        while heap and self.entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+
+    def popleft(self):
+        self._clean()
+        if not self.heap:
+            raise IndexError("pop from an empty wait queue")
+        thread = heapq.heappop(self.heap)[2]
+        del self.entries[thread]
+        return thread
+
+    def highest_priority(self):
+        self._clean()
+        return self.heap[0][0] if self.heap else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(sorted(self.entries, key=self.entries.get))
+
+
+WAIT_QUEUES = {
+    "fifo": FIFOWaitQueue,
+    "priority": PriorityWaitQueue,
+}
+
+
+def new_wait_queue(kind="fifo"):
+    if kind not in WAIT_QUEUES:
+        raise ValueError(f"unknown wait queue: {kind}")
+    return WAIT_QUEUES[kind]()
@@ -0,0 +1,31 @@
+import random
+
+from utils.metrics import Metrics
+from utils.batch_metrics import batch_metrics
+
+
+def test_response_percentiles_agree_with_batch_metrics():
+    rng = random.Random(0)
+    for _ in range(500):
+        n = rng.randint(1, 60)
+        arrival = [rng.randint(0, 50) for _ in range(n)]
+        burst = [rng.randint(1, 9) for _ in range(n)]
+        first_run = [a + rng.randint(0, 40) for a in arrival]
+        completion = [f + b for f, b in zip(first_run, burst)]
+
+        metrics = Metrics()
+        for a, f in zip(arrival, first_run):
+            metrics.record_response(f - a)
+        summary = metrics.summary()
+        batch = batch_metrics(arrival, burst, completion, first_run)
+        for key in ("p95_response_time", "p99_response_time"):
+            assert summary[key] == batch[key]
+
+
+def test_summary_sees_responses_recorded_after_a_summary():
+    metrics = Metrics()
+    for response in (5, 1, 3):
+        metrics.record_response(response)
+    assert metrics.summary()["p95_response_time"] == 5
+    metrics.record_response(9)
+    assert metrics.summary()["p95_response_time"] == 9
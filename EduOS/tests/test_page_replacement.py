@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from memory.page_replacement import optimal, next_use_indices
+from memory.trace import write_trace, write_next_use, read_binary_trace, iter_pages
+
+
+def reference_optimal(pages, frames):
+    # The original list-scanning implementation
+    memory = []
+    faults = 0
+    for i, page in enumerate(pages):
+        if page not in memory:
+            faults += 1
+            if len(memory) < frames:
+                memory.append(page)
+            else:
+                future = pages[i + 1:]
+                index = {m: future.index(m) if m in future else float("inf") for m in memory}
+                memory.remove(max(index, key=index.get))
+                memory.append(page)
+    return faults
+
+
+def random_traces(count=1500, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        pages = [rng.randrange(rng.randint(1, 12)) for _ in range(rng.randint(0, 60))]
+        yield pages, rng.randint(1, 6)
+
+
+def test_optimal_matches_reference():
+    for pages, frames in random_traces():
+        expected = reference_optimal(pages, frames)
+        assert optimal(pages, frames) == expected
+        assert optimal(iter(pages), frames, next_use=iter(next_use_indices(pages))) == expected
+
+
+def test_optimal_streamed_from_trace_files(tmp_path):
+    trace, uses = tmp_path / "trace.bin", tmp_path / "next_use.bin"
+    for pages, frames in random_traces(count=100, seed=1):
+        write_trace(trace, pages)
+        write_next_use(trace, uses, chunk_size=7)
+        streamed = optimal(iter_pages(read_binary_trace(trace, chunk_size=5)), frames,
+                           next_use=iter_pages(read_binary_trace(uses, chunk_size=5)))
+        assert streamed == reference_optimal(pages, frames)
+
+
+def test_optimal_rejects_short_next_use():
+    pages = [1, 2, 3, 1, 2]
+    with pytest.raises(ValueError):
+        optimal(pages, 2, next_use=next_use_indices(pages)[:3])
@@ -0,0 +1,12 @@
+from process.table import ProcessTable
+from scheduler.preemptive_priority import preemptive_priority
+
+
+def test_reset_restores_aged_priorities():
+    table = ProcessTable.from_arrays([1, 2, 3], [0, 0, 2], [6, 6, 3], [4, 4, 2])
+    first = preemptive_priority(table.views())
+    assert table.priority.tolist() != [4, 4, 2]
+
+    table.reset()
+    assert table.priority.tolist() == [4, 4, 2]
+    assert preemptive_priority(table.views()) == first
@@ -0,0 +1,13 @@
+import pytest
+
+from experiments.run_policy import run_scheduler
+from kernel.kernel import Kernel
+from process.process import Process
+from scheduler.srtf import SRTFPolicy, srtf
+
+
+@pytest.mark.parametrize("policy", [SRTFPolicy(), srtf])
+def test_idle_gap_is_not_busy_time(policy):
+    # The CPU idles from 2 to 10 between the two processes
+    summary, _ = run_scheduler(Kernel(), policy, [Process(1, 0, 2), Process(2, 10, 2)])
+    assert summary["cpu_utilization"] == pytest.approx(4 / 12)
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from process.process import Process
+from sync.mutex import Mutex
+from sync.priority import PriorityInheritance, PriorityCeiling
+from sync.wait_queue import FIFOWaitQueue, PriorityWaitQueue
+
+
+def make_threads(priorities):
+    return [Process(pid, 0, 1, priority).create_thread()
+            for pid, priority in enumerate(priorities)]
+
+
+@pytest.mark.parametrize("kind", [FIFOWaitQueue, PriorityWaitQueue])
+def test_highest_priority_tracks_waiters(kind):
+    rng = random.Random(0)
+    threads = make_threads(rng.randrange(6) for _ in range(30))
+    queue = kind()
+    waiting = []
+    for step in range(2000):
+        op = rng.random()
+        if op < 0.4:
+            thread = rng.choice(threads)
+            if thread not in waiting:
+                queue.append(thread)
+                waiting.append(thread)
+        elif op < 0.6 and waiting:
+            thread = rng.choice(waiting)
+            thread.process.pcb.priority = rng.randrange(6)
+            queue.update(thread)
+        elif op < 0.7 and waiting:
+            thread = rng.choice(waiting)
+            queue.remove(thread)
+            waiting.remove(thread)
+        elif waiting:
+            waiting.remove(queue.popleft())
+        assert len(queue) == len(waiting)
+        expected = min((t.process.pcb.priority for t in waiting), default=None)
+        assert queue.highest_priority() == expected
+
+
+@pytest.mark.parametrize("queue", ["fifo", "priority"])
+def test_inheritance_boosts_and_restores(queue):
+    protocol = PriorityInheritance()
+    low, mid, high = make_threads([5, 3, 1])
+    a, b = Mutex(queue=queue, protocol=protocol), Mutex(queue=queue, protocol=protocol)
+
+    a.acquire(low)
+    b.acquire(mid)
+    a.acquire(mid)                  # mid waits for low
+    assert low.process.pcb.priority == 3
+    b.acquire(high)                 # high waits for mid, passed on to low
+    assert mid.process.pcb.priority == 1
+    assert low.process.pcb.priority == 1
+
+    a.release()                     # low -> mid
+    assert low.process.pcb.priority == 5
+    b.release()                     # mid -> high
+    a.release()
+    assert mid.process.pcb.priority == 3
+    b.release()
+    assert high.process.pcb.priority == 1
+    assert not protocol.base and not protocol.held and not protocol.blocked
+
+
+def test_ceiling_raises_owner_while_held():
+    protocol = PriorityCeiling()
+    (thread,) = make_threads([6])
+    mutex = Mutex(protocol=protocol, ceiling=2)
+    mutex.acquire(thread)
+    assert thread.process.pcb.priority == 2
+    mutex.release()
+    assert thread.process.pcb.priority == 6
+
+
+@pytest.mark.parametrize("protocol", [None, PriorityInheritance, PriorityCeiling])
+def test_release_of_unowned_mutex(protocol):
+    mutex = Mutex(protocol=protocol() if protocol else None)
+    mutex.release()
+    assert not mutex.locked and mutex.owner is None
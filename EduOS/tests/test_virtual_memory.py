@@ -0,0 +1,51 @@
+import pytest
+
+from memory.allocation import WorkingSetAllocator
+from memory.virtual_memory import VirtualMemoryManager
+from process.process import Process
+
+
+def test_unknown_page_table_format_is_a_value_error():
+    with pytest.raises(ValueError):
+        VirtualMemoryManager(4, page_table_format="inverted")
+
+
+def test_working_set_reclaims_inactive_pages_first():
+    vm = VirtualMemoryManager(4, allocator=WorkingSetAllocator(window=2))
+    first, second = Process(0, 0, 1), Process(1, 0, 1)
+    for page in (0, 1, 2, 3):
+        vm.access(first, page, 1)
+    # Pages 0 and 1 left the working set but are still a hit
+    assert vm.access(first, 0, 1) == (0, False)
+
+    # Memory is full: the other process takes page 1, the first to leave
+    # the working set, where the global clock would have taken page 0
+    vm.access(second, 0, 1)
+    assert sorted(first.pcb.page_table) == [0, 2, 3]
+
+
+def test_suspend_frees_frames_and_keeps_the_working_set():
+    allocator = WorkingSetAllocator(window=4)
+    vm = VirtualMemoryManager(4, allocator=allocator)
+    process = Process(0, 0, 1)
+    for page in (0, 1, 2):
+        vm.access(process, page, 1)
+    vm.suspend(process)
+    assert not process.pcb.page_table and len(vm.free_frames) == 4
+    assert allocator.demand(0) == 3
+
+
+def test_first_write_after_fork_copies_one_second_level_array():
+    vm = VirtualMemoryManager(128, page_table_format="two_level")
+    parent, child = Process(0, 0, 1), Process(1, 0, 1)
+    pages = range(0, 4096, 64)      # four second-level arrays
+    for page in pages:
+        vm.access(parent, page, 1)
+    vm.fork(parent, child)
+
+    vm.access(child, 0, 1, write=True)
+    parent_table, child_table = parent.pcb.page_table, child.pcb.page_table
+    assert [a is b for a, b in zip(parent_table.nodes(), child_table.nodes())] == [False, True, True, True]
+    assert child_table[0] != parent_table[0]
+    assert all(child_table[page] == parent_table[page] for page in pages[1:])
+    assert vm.cow_faults == 1
@@ -1,4 +1,6 @@
 class Thread:
+    __slots__ = ("tid", "process", "state")
+
     def __init__(self, tid, process):
         self.tid = tid
         self.process = process
@@ -0,0 +1,71 @@
+"""
+Batch Metrics
+Vectorized scheduling metrics over columnar process data (NumPy)
+"""
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+def batch_metrics(arrival_time, burst_time, completion_time, first_run_time=None,
+                  percentiles=PERCENTILES):
+    """
+    Calculate scheduling metrics for a whole workload in one pass
+
+    Args:
+        arrival_time: Array of arrival times
+        burst_time: Array of CPU burst lengths
+        completion_time: Array of completion times
+        first_run_time: Optional array of first dispatch times, needed for
+            response time
+        percentiles: Percentiles to report for every per-process metric
+
+    Returns:
+        dict: avg_* and p<N>_* for waiting, turnaround and (if given)
+        response time, plus throughput and cpu_utilization
+    """
+    arrival = np.asarray(arrival_time, dtype=np.float64)
+    burst = np.asarray(burst_time, dtype=np.float64)
+    completion = np.asarray(completion_time, dtype=np.float64)
+
+    turnaround = completion - arrival
+    names = ["waiting_time", "turnaround_time"]
+    rows = [turnaround - burst, turnaround]
+    if first_run_time is not None:
+        names.append("response_time")
+        rows.append(np.asarray(first_run_time, dtype=np.float64) - arrival)
+
+    results = {}
+    if len(arrival) == 0:
+        for name in names:
+            results[f"avg_{name}"] = 0
+            for q in percentiles:
+                results[f"p{q}_{name}"] = 0
+        results["throughput"] = 0
+        results["cpu_utilization"] = 0
+        return results
+
+    values = np.stack(rows)
+    means = values.mean(axis=1)
+    # Nearest-rank percentiles, the same definition as Metrics.summary()
+    tails = (np.percentile(values, percentiles, axis=1, method="inverted_cdf")
+             if percentiles else [])
+    for i, name in enumerate(names):
+        results[f"avg_{name}"] = float(means[i])
+        for j, q in enumerate(percentiles):
+            results[f"p{q}_{name}"] = float(tails[j][i])
+
+    # The simulated clock starts at 0
+    makespan = float(completion.max())
+    results["throughput"] = len(arrival) / makespan if makespan else 0
+    results["cpu_utilization"] = float(burst.sum()) / makespan if makespan else 0
+    return results
+
+
+def table_metrics(table, percentiles=PERCENTILES):
+    """Batch metrics for the completed rows of a ProcessTable"""
+    done = table.completed()
+    return batch_metrics(table.arrival_time[done], table.burst_time[done],
+                         table.completion_time[done], table.first_run_time[done],
+                         percentiles=percentiles)
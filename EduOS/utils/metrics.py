@@ -1,12 +1,37 @@
+# Cost model for effective access time (ns)
+TLB_LOOKUP_TIME = 1
+MEMORY_ACCESS_TIME = 100
+
+
 class Metrics:
-    def __init__(self):
+    def __init__(self, streaming=False):
+        # Streaming mode keeps only running sums, so memory stays flat no
+        # matter how many processes are recorded
+        self.streaming = streaming
+
         self.waiting_times = []
         self.turnaround_times = []
         self.response_times = []
+        self._sorted_response_times = None  # summary() cache, reset on record
         self.completion_times = []
 
+        self.process_count = 0
+        self.total_waiting_time = 0
+        self.total_turnaround_time = 0
+        self.response_count = 0
+        self.total_response_time = 0
+        self.max_response_time = 0
+
         self.page_faults = 0
         self.memory_accesses = 0
+        self.tlb_hits = 0
+        self.tlb_misses = 0
+        self.cow_faults = 0
+
+        self.deadlocks = 0
+        self.total_detection_latency = 0
+        self.max_detection_latency = 0
+        self.victim_rollback = 0
 
         self.cpu_busy_time = 0
         self.total_time = 0
@@ -15,11 +40,26 @@ class Metrics:
         turnaround = process.pcb.completion_time - process.pcb.arrival_time
         waiting = turnaround - process.pcb.burst_time
 
-        self.turnaround_times.append(turnaround)
-        self.waiting_times.append(waiting)
+        self.process_count += 1
+        self.total_turnaround_time += turnaround
+        self.total_waiting_time += waiting
+
+        if not self.streaming:
+            self.turnaround_times.append(turnaround)
+            self.waiting_times.append(waiting)
+
+        # Set by the scheduler on first dispatch
+        if process.pcb.first_run_time is not None:
+            self.record_response(process.pcb.first_run_time - process.pcb.arrival_time)
 
     def record_response(self, response_time):
-        self.response_times.append(response_time)
+        self.response_count += 1
+        self.total_response_time += response_time
+        self.max_response_time = max(self.max_response_time, response_time)
+
+        if not self.streaming:
+            self.response_times.append(response_time)
+            self._sorted_response_times = None
 
     def record_cpu_tick(self):
         self.cpu_busy_time += 1
@@ -27,24 +67,77 @@ class Metrics:
     def record_time(self):
         self.total_time += 1
 
-    def record_page_access(self, fault=False):
-        self.memory_accesses += 1
+    def record_page_access(self, fault=False, count=1):
+        self.memory_accesses += count
         if fault:
-            self.page_faults += 1
+            self.page_faults += count
+
+    def record_tlb_access(self, hit, count=1):
+        if hit:
+            self.tlb_hits += count
+        else:
+            self.tlb_misses += count
+
+    def record_cow_fault(self):
+        self.cow_faults += 1
+
+    def record_deadlock(self, latency, rollback):
+        # latency: ns from the closing request to detection; rollback:
+        # resource units the aborted victim gave up
+        self.deadlocks += 1
+        self.total_detection_latency += latency
+        self.max_detection_latency = max(self.max_detection_latency, latency)
+        self.victim_rollback += rollback
+
+    def effective_access_time(self):
+        # Every access pays a TLB lookup and the memory access itself; a
+        # TLB miss also pays one memory access to read the page table
+        lookups = self.tlb_hits + self.tlb_misses
+        if not lookups:
+            return 0
+        return TLB_LOOKUP_TIME + MEMORY_ACCESS_TIME * (1 + self.tlb_misses / lookups)
 
     def summary(self):
+        # Tail percentiles need the per-process list, so not when streaming;
+        # it is sorted once and reused until the next response is recorded
+        if self.streaming:
+            ordered = None
+        else:
+            if self._sorted_response_times is None:
+                self._sorted_response_times = sorted(self.response_times)
+            ordered = self._sorted_response_times
         return {
-            "avg_waiting_time": sum(self.waiting_times) / len(self.waiting_times),
-            "avg_turnaround_time": sum(self.turnaround_times) / len(self.turnaround_times),
-            "avg_response_time": sum(self.response_times) / len(self.response_times),
-            "cpu_utilization": self.cpu_busy_time / self.total_time,
-            "page_fault_rate": (
-                self.page_faults / self.memory_accesses
-                if self.memory_accesses else 0
-            )
+            "avg_waiting_time": _average(self.total_waiting_time, self.process_count),
+            "avg_turnaround_time": _average(self.total_turnaround_time, self.process_count),
+            "avg_response_time": _average(self.total_response_time, self.response_count),
+            "p95_response_time": None if ordered is None else _percentile(ordered, 95),
+            "p99_response_time": None if ordered is None else _percentile(ordered, 99),
+            "max_response_time": self.max_response_time,
+            "cpu_utilization": _average(self.cpu_busy_time, self.total_time),
+            "page_fault_rate": _average(self.page_faults, self.memory_accesses),
+            "tlb_hit_rate": _average(self.tlb_hits, self.tlb_hits + self.tlb_misses),
+            "effective_access_time": self.effective_access_time(),
+            "cow_faults": self.cow_faults,
+            "deadlocks": self.deadlocks,
+            "avg_detection_latency": _average(self.total_detection_latency, self.deadlocks),
+            "max_detection_latency": self.max_detection_latency,
+            "avg_victim_rollback": _average(self.victim_rollback, self.deadlocks)
         }
 
 
+def _average(total, count):
+    return total / count if count else 0
+
+
+def _percentile(ordered, q):
+    # Nearest-rank percentile of a sorted list: the smallest value with at
+    # least q% of the values at or below it. utils.batch_metrics uses the
+    # same definition (np.percentile's "inverted_cdf" method).
+    if not ordered:
+        return 0
+    return ordered[max(0, -(-len(ordered) * q // 100) - 1)]
+
+
 def calculate_metrics(processes):
     """
     Calculate scheduling metrics for a list of processes
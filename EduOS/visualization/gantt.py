@@ -17,3 +17,14 @@ def plot_page_faults(faults_over_time):
     plt.ylabel("Cumulative Page Faults")
     plt.title("Page Fault Growth")
     plt.show()
+
+def plot_fault_curves(curves):
+    # curves maps a label to a fault curve, where curve[f] is the fault
+    # count with f frames (see memory/stack_distance.py)
+    for label, curve in curves.items():
+        plt.plot(range(1, len(curve)), curve[1:], label=label)
+    plt.xlabel("Frames")
+    plt.ylabel("Page Faults")
+    plt.title("Page Faults vs Frame Count")
+    plt.legend()
+    plt.show()